@@ -1,38 +1,50 @@
 
 import os
-import pygame
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+startup_timer = None
+if __name__ == "__main__":
+    from startup_profile import profile_startup
+    startup_timer = profile_startup()  # Times the imports below when run with --profile-startup
+
+import shutil
+import argparse
 import random
 import math
-import pandas as pd
-import uproot
-import google.generativeai as genai
+import itertools
+import numpy as np
 from datetime import datetime
 import json
 import time
 
-# Configure Gemini API
-GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
-if GOOGLE_API_KEY:
-    genai.configure(api_key=GOOGLE_API_KEY)
-else:
-    print("Error: GOOGLE_API_KEY is not set. Please configure the environment variable.")
+from momentum_pool import MomentumPool, load_momentum_pool
+from summary_log import SUMMARY_LOG_NAME, append_summary
 
 # Screen dimensions
 width, height = 800, 600
-screen = pygame.display.set_mode((width, height))
-pygame.display.set_caption("IntentSim - Continuous Universe Simulation")
+pygame = None  # Imported by init_display so headless runs never load it
+screen = None
 
 # Intent field properties
 depth = 100
-intent_field = [[[random.uniform(-1, 1) for _ in range(width)]
-                 for _ in range(height)]
-                for _ in range(depth)]
+intent_field_scale = 1.0  # Field cells per screen unit; below 1 keeps a coarser field
+intent_field_dtype = np.float32  # np.float16 halves the memory again
+intent_field_mode = "dense"  # "lazy" only materializes the cells that particles sample
+field_depth = field_height = field_width = None  # Derived from intent_field_scale when the field is built
+field_rng = None  # numpy Generator for the intent field, set by seed_random_streams
+particle_rng = None  # random.Random for particle creation, set by seed_random_streams
+intent_field = None
+field_noise = None  # Reused by every fluctuation step
 intent_fluctuation_rate = 0.01
+field_version = 0  # Bumped whenever the field changes, so cached statistics know they are stale
+field_stats = None  # Statistics of the field at field_stats["version"]
+field_histogram_bins = 0  # Adds a histogram of cell values to the statistics when > 0
 particle_creation_thresholds = []  # Initialize as an empty list
 
 # Particle properties
 particle_radius = 5
-particles = []  # Initialize as an empty list
+particles = []  # Replaced by particle_system.particles once the Particle class is defined
 max_particles = 300
 learning_rate = 0.1
 
@@ -61,72 +73,452 @@ os.makedirs(current_data_dir, exist_ok=True)
 start_time = time.time()
 last_save_time = start_time
 save_interval = 3600  # Save data every hour
+stats_interval = 100  # Frames between statistics updates
+
+# Checkpoints of the full simulation state
+checkpoint_dir = os.path.join(data_dir, "checkpoints")
+checkpoint_interval = 600  # Seconds between checkpoints; 0 disables them
+checkpoint_keep = 3  # Only the newest checkpoints are kept
 
 # --- ATLAS Data Integration ---
 # Replace these paths with the actual paths to your downloaded ATLAS datasets
 experimental_data_path = "ATLAS_experimental.root"
 simulation_data_path = "ATLAS_simulation.root"
+placeholder_rng = random.Random(0)  # Fixed so seeded runs see the same placeholder data
+
+def placeholder_momentum_pool():
+    """Uniform random momenta standing in for ATLAS data"""
+    px = [placeholder_rng.uniform(-10, 10) for _ in range(100)]
+    py = [placeholder_rng.uniform(-10, 10) for _ in range(100)]
+    pz = [placeholder_rng.uniform(-10, 10) for _ in range(100)]
+    return MomentumPool(np.column_stack([px, py, pz]))
+
+experimental_pool = None
+simulation_pool = None
+
+def load_momentum_pools():
+    """Loads the momentum pools on the first particle creation"""
+    global experimental_pool, simulation_pool
+    try:
+        # Sample px/py/pz from the ATLAS trees in bounded chunks, or load the cached samples
+        experimental_pool = MomentumPool(load_momentum_pool(experimental_data_path, "Events"))  # Replace "Events" with the actual tree name
+        simulation_pool = MomentumPool(load_momentum_pool(simulation_data_path, "Events"))
+        print("ATLAS data loaded successfully.")
+    except FileNotFoundError:
+        print("Error: ATLAS data file not found. Using simplified simulation data instead.")
+        # Create simplified example data
+        experimental_pool = placeholder_momentum_pool()
+        simulation_pool = placeholder_momentum_pool()
+    except Exception as e:
+        print(f"Error loading ATLAS data: {e}")
+        # Create simplified example data
+        experimental_pool = placeholder_momentum_pool()
+        simulation_pool = placeholder_momentum_pool()
+
+class LazyIntentField:
+    """
+    Procedural intent field that only materializes the cells particles sample.
+    An untouched cell starts from a value hashed from (seed, cell) and then
+    follows the same clamped uniform random walk as the dense field, caught
+    up in one go from the frame it was last touched. Cells left idle for
+    more than idle_frames are evicted and become untouched cells again.
+    """
+    exact_steps = 16  # Longer walks use the normal approximation of the sum
+
+    def __init__(self, shape, fluctuation_rate, seed=None, idle_frames=10000):
+        self.shape = shape
+        self.size = shape[0] * shape[1] * shape[2]
+        self.fluctuation_rate = fluctuation_rate
+        self.idle_frames = idle_frames
+        self.seed = seed if seed is not None else random.getrandbits(64)
+        self.rng = random.Random(self.seed)
+        self.frame = 0
+        self.cells = {}  # cell index -> [value, last touched frame]
+        self.abs_sum = 0.0  # Running sum of |value| over materialized cells
+        self.min = math.inf  # Extremes of every value written so far
+        self.max = -math.inf
+
+    def initial_value(self, index):
+        # splitmix64 hash of (seed, cell) mapped to [-1, 1)
+        mask = (1 << 64) - 1
+        h = (self.seed + (index + 1) * 0x9E3779B97F4A7C15) & mask
+        h = ((h ^ (h >> 30)) * 0xBF58476D1CE4E5B9) & mask
+        h = ((h ^ (h >> 27)) * 0x94D049BB133111EB) & mask
+        h ^= h >> 31
+        return (h >> 11) / float(1 << 53) * 2 - 1
+
+    def walk(self, value, steps):
+        rate = self.fluctuation_rate
+        if steps <= self.exact_steps:
+            for _ in range(steps):
+                value = max(min(value + self.rng.uniform(-rate, rate), 1), -1)
+            return value
+        # Sum of `steps` uniform(-rate, rate) draws has variance steps * rate^2 / 3.
+        # Reflecting it at the bounds keeps the walk's near-uniform spread, where
+        # clamping would pile every long walk that overshoots up at -1 or 1
+        value = (value + 1 + self.rng.gauss(0, rate * math.sqrt(steps / 3))) % 4
+        return (4 - value if value > 2 else value) - 1
+
+    def advance(self):
+        self.frame += 1
+        if self.frame % max(1, self.idle_frames // 4) == 0:
+            self.evict_idle()
+
+    def evict_idle(self):
+        """Drops the cells untouched for more than idle_frames and returns how many"""
+        cutoff = self.frame - self.idle_frames
+        idle = [index for index, cell in self.cells.items() if cell[1] < cutoff]
+        for index in idle:
+            self.abs_sum -= abs(self.cells.pop(index)[0])
+        return len(idle)
+
+    def value(self, z, y, x):
+        index = (z * self.shape[1] + y) * self.shape[2] + x
+        cell = self.cells.get(index)
+        if cell is None:
+            value = self.initial_value(index)
+            cell = self.cells[index] = [value, 0]
+            self.abs_sum += abs(value)
+        steps = self.frame - cell[1]
+        if steps > 0:
+            old_value = cell[0]
+            cell[0] = self.walk(old_value, steps)
+            cell[1] = self.frame
+            self.abs_sum += abs(cell[0]) - abs(old_value)
+        value = cell[0]
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        return value
+
+    def mean_abs(self):
+        # Untouched cells are still uniform on [-1, 1], so their expected |value| is 0.5
+        untouched = self.size - len(self.cells)
+        return (self.abs_sum + 0.5 * untouched) / self.size
+
+lazy_intent_field = None
+
+def update_field_dimensions():
+    """Sets the field dimensions for the screen size and intent_field_scale"""
+    global field_depth, field_height, field_width
+    field_depth = max(2, int(math.ceil(depth * intent_field_scale)))
+    field_height = max(2, int(math.ceil(height * intent_field_scale)))
+    field_width = max(2, int(math.ceil(width * intent_field_scale)))
+    return (field_depth, field_height, field_width)
 
-try:
-    # Load ATLAS experimental data
-    experimental_file = uproot.open(experimental_data_path)
-    experimental_tree = experimental_file["Events"]  # Replace "Events" with the actual tree name
-    experimental_data = experimental_tree.arrays(library="pd")
-    experimental_file.close()
-
-    # Load ATLAS simulation data
-    simulation_file = uproot.open(simulation_data_path)
-    simulation_tree = simulation_file["Events"]  # Replace "Events" with the actual tree name
-    simulation_data = simulation_tree.arrays(library="pd")
-    simulation_file.close()
-
-    print("ATLAS data loaded successfully.")
-except FileNotFoundError:
-    print("Error: ATLAS data file not found. Using simplified simulation data instead.")
-    # Create simplified example data
-    experimental_data = pd.DataFrame({
-        'particle_type': ['electron', 'proton', 'neutron', 'photon'] * 25,
-        'px': [random.uniform(-10, 10) for _ in range(100)],
-        'py': [random.uniform(-10, 10) for _ in range(100)],
-        'pz': [random.uniform(-10, 10) for _ in range(100)]
-    })
-    simulation_data = pd.DataFrame({
-        'particle_type': ['electron', 'proton', 'neutron', 'photon'] * 25,
-        'px': [random.uniform(-10, 10) for _ in range(100)],
-        'py': [random.uniform(-10, 10) for _ in range(100)],
-        'pz': [random.uniform(-10, 10) for _ in range(100)]
-    })
-except Exception as e:
-    print(f"Error loading ATLAS data: {e}")
-    # Create simplified example data
-    experimental_data = pd.DataFrame({
-        'particle_type': ['electron', 'proton', 'neutron', 'photon'] * 25,
-        'px': [random.uniform(-10, 10) for _ in range(100)],
-        'py': [random.uniform(-10, 10) for _ in range(100)],
-        'pz': [random.uniform(-10, 10) for _ in range(100)]
-    })
-    simulation_data = pd.DataFrame({
-        'particle_type': ['electron', 'proton', 'neutron', 'photon'] * 25,
-        'px': [random.uniform(-10, 10) for _ in range(100)],
-        'py': [random.uniform(-10, 10) for _ in range(100)],
-        'pz': [random.uniform(-10, 10) for _ in range(100)]
-    })
+def init_intent_field():
+    """Allocates a fresh intent field for the current mode and scale from field_rng"""
+    global intent_field, field_noise, lazy_intent_field, field_version
+    field_version += 1
+    shape = update_field_dimensions()
+    if intent_field_mode == "lazy":
+        intent_field = field_noise = None
+        lazy_intent_field = LazyIntentField(shape, intent_fluctuation_rate,
+                                            seed=int(field_rng.integers(2**63)))
+    else:
+        lazy_intent_field = None
+        intent_field = None  # Free the old field before allocating the new one
+        intent_field = field_rng.random(shape, dtype=np.float32)
+        intent_field *= 2
+        intent_field -= 1
+        intent_field = intent_field.astype(intent_field_dtype, copy=False)
+        field_noise = np.empty(shape, dtype=np.float32)
+
+def seed_random_streams(seed=None, build_field=True):
+    """
+    Seeds independent field and particle streams from one seed and rebuilds
+    the intent field, so the same seed always replays the same run
+    """
+    global field_rng, particle_rng
+    field_seq, particle_seq = np.random.SeedSequence(seed).spawn(2)
+    field_rng = np.random.default_rng(field_seq)
+    # Particle creation draws one scalar at a time, which random.Random does much faster
+    particle_rng = random.Random(int(particle_seq.generate_state(1, np.uint64)[0]))
+    if build_field:
+        init_intent_field()
+
+def ensure_intent_field():
+    """Allocates the intent field if nothing has built or restored one yet"""
+    if intent_field is None and lazy_intent_field is None:
+        init_intent_field()
+
+seed_random_streams(build_field=False)  # The field is allocated when a run starts, not at import
+
+def field_cell(z, y, x):
+    """Value of a single field cell in either field mode"""
+    if lazy_intent_field is not None:
+        return lazy_intent_field.value(z, y, x)
+    return float(intent_field[z, y, x])
+
+class FieldSummary:
+    """Running |value| sum, min, max and optional histogram over blocks of field cells"""
+    def __init__(self, bins=0):
+        self.abs_sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.histogram = np.zeros(bins, dtype=np.int64) if bins else None
+    
+    def add(self, block, scratch):
+        """Adds a block of cells; scratch is a float32 buffer of the block's shape"""
+        np.abs(block, out=scratch)
+        self.abs_sum += float(scratch.sum(dtype=np.float64))
+        self.min = min(self.min, float(block.min()))
+        self.max = max(self.max, float(block.max()))
+        if self.histogram is not None:
+            bins = len(self.histogram)
+            np.add(block, 1, out=scratch)
+            np.multiply(scratch, bins / 2, out=scratch)
+            index = np.minimum(scratch.astype(np.intp), bins - 1)  # Puts exactly 1.0 in the last bin
+            self.histogram += np.bincount(index.ravel(), minlength=bins)
+    
+    def stats(self, size):
+        return {
+            "version": field_version,
+            "mean_abs": self.abs_sum / size,
+            "min": self.min,
+            "max": self.max,
+            "histogram": self.histogram.tolist() if self.histogram is not None else None
+        }
+
+def intent_field_stats():
+    """
+    Mean |value|, min, max and (with field_histogram_bins) a histogram of
+    the intent field. A dense field is summarized at most once per change,
+    normally for free by the fluctuation step before a statistics frame.
+    """
+    global field_stats
+    if lazy_intent_field is not None:
+        # Untouched lazy cells span [-1, 1]; min/max are the running extremes of the sampled values
+        sampled = lazy_intent_field.min <= lazy_intent_field.max
+        return {
+            "version": field_version,
+            "mean_abs": lazy_intent_field.mean_abs(),
+            "min": float(lazy_intent_field.min) if sampled else -1.0,
+            "max": float(lazy_intent_field.max) if sampled else 1.0,
+            "histogram": None
+        }
+    if field_stats is None or field_stats["version"] != field_version:
+        summary = FieldSummary(field_histogram_bins)
+        for z in range(intent_field.shape[0]):
+            summary.add(intent_field[z], field_noise[z])  # The noise buffer is free between steps
+        field_stats = summary.stats(intent_field.size)
+    return field_stats
+
+def intent_field_mean_abs():
+    """Mean |value| over the whole intent field"""
+    return intent_field_stats()["mean_abs"]
+
+def fluctuate_intent_field(summarize=False):
+    """
+    Adds uniform noise to every cell and clamps the field to [-1, 1] in
+    place. With summarize=True the field statistics are gathered in the
+    same pass, one depth slice at a time while it is still in cache.
+    """
+    global field_version, field_stats
+    field_version += 1
+    if lazy_intent_field is not None:
+        # Lazy cells catch up on their fluctuations when they are next sampled
+        lazy_intent_field.advance()
+        return
+    field_rng.random(dtype=np.float32, out=field_noise)
+    np.multiply(field_noise, 2 * intent_fluctuation_rate, out=field_noise)
+    np.subtract(field_noise, intent_fluctuation_rate, out=field_noise)
+    if not summarize:
+        np.add(intent_field, field_noise, out=intent_field, casting="unsafe")
+        np.clip(intent_field, -1, 1, out=intent_field)
+        return
+    summary = FieldSummary(field_histogram_bins)
+    for z in range(intent_field.shape[0]):
+        cells, noise = intent_field[z], field_noise[z]
+        np.add(cells, noise, out=cells, casting="unsafe")
+        np.clip(cells, -1, 1, out=cells)
+        summary.add(cells, noise)  # This slice's noise is used up, so it doubles as scratch
+    field_stats = summary.stats(intent_field.size)
+
+def sample_intent_field(x, y, z):
+    """Intent field value at a screen position"""
+    if intent_field_scale == 1:
+        x_index = min(max(0, int(x)), field_width - 1)
+        y_index = min(max(0, int(y)), field_height - 1)
+        z_index = min(max(0, int(z)), field_depth - 1)
+        return field_cell(z_index, y_index, x_index)
+    
+    # Trilinear interpolation between the 8 surrounding field cells
+    fx = min(max(x * intent_field_scale, 0.0), field_width - 1.0)
+    fy = min(max(y * intent_field_scale, 0.0), field_height - 1.0)
+    fz = min(max(z * intent_field_scale, 0.0), field_depth - 1.0)
+    x0, y0, z0 = int(fx), int(fy), int(fz)
+    x1, y1, z1 = min(x0 + 1, field_width - 1), min(y0 + 1, field_height - 1), min(z0 + 1, field_depth - 1)
+    tx, ty, tz = fx - x0, fy - y0, fz - z0
+    
+    c00 = field_cell(z0, y0, x0) * (1 - tx) + field_cell(z0, y0, x1) * tx
+    c01 = field_cell(z0, y1, x0) * (1 - tx) + field_cell(z0, y1, x1) * tx
+    c10 = field_cell(z1, y0, x0) * (1 - tx) + field_cell(z1, y0, x1) * tx
+    c11 = field_cell(z1, y1, x0) * (1 - tx) + field_cell(z1, y1, x1) * tx
+    c0 = c00 * (1 - ty) + c01 * ty
+    c1 = c10 * (1 - ty) + c11 * ty
+    return float(c0 * (1 - tz) + c1 * tz)
+
+def sample_intent_field_batch(x, y, z):
+    """Intent field values at arrays of screen positions"""
+    if lazy_intent_field is not None:
+        # Lazy cells advance their own random walks, so sample them one at a time in order
+        return np.array([sample_intent_field(px, py, pz) for px, py, pz in zip(x.tolist(), y.tolist(), z.tolist())])
+    if intent_field_scale == 1:
+        x_index = np.clip(x, 0, field_width - 1).astype(np.intp)
+        y_index = np.clip(y, 0, field_height - 1).astype(np.intp)
+        z_index = np.clip(z, 0, field_depth - 1).astype(np.intp)
+        return intent_field[z_index, y_index, x_index].astype(np.float64)
+    
+    fx = np.clip(x * intent_field_scale, 0.0, field_width - 1.0)
+    fy = np.clip(y * intent_field_scale, 0.0, field_height - 1.0)
+    fz = np.clip(z * intent_field_scale, 0.0, field_depth - 1.0)
+    x0, y0, z0 = fx.astype(np.intp), fy.astype(np.intp), fz.astype(np.intp)
+    x1, y1, z1 = np.minimum(x0 + 1, field_width - 1), np.minimum(y0 + 1, field_height - 1), np.minimum(z0 + 1, field_depth - 1)
+    tx, ty, tz = fx - x0, fy - y0, fz - z0
+    
+    f = intent_field
+    c00 = f[z0, y0, x0] * (1 - tx) + f[z0, y0, x1] * tx
+    c01 = f[z0, y1, x0] * (1 - tx) + f[z0, y1, x1] * tx
+    c10 = f[z1, y0, x0] * (1 - tx) + f[z1, y0, x1] * tx
+    c11 = f[z1, y1, x0] * (1 - tx) + f[z1, y1, x1] * tx
+    c0 = c00 * (1 - ty) + c01 * ty
+    c1 = c10 * (1 - ty) + c11 * ty
+    return c0 * (1 - tz) + c1 * tz
+
+# Neighbour search properties
+interaction_radii = {"positive": 80, "negative": 30}
+default_interaction_radius = 50
+neighbour_cell_size = max(interaction_radii.values())
+
+# Charge codes for particle types; the batched step looks up per-charge constants by code
+POSITIVE_CHARGE, NEGATIVE_CHARGE, NEUTRAL_CHARGE = range(3)
+intent_multipliers = np.array([1.5, 0.5, 1.0])
+learning_modifiers = np.array([0.2, 0.05, 0.1])
+color_blend_rate = 0.05
+
+def charge_code(particle_type):
+    if "positive" in particle_type:
+        return POSITIVE_CHARGE
+    elif "negative" in particle_type:
+        return NEGATIVE_CHARGE
+    return NEUTRAL_CHARGE
+
+class SpatialGrid:
+    """Uniform grid of particles that answers radius queries"""
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = {}  # (cx, cy, cz) -> {particle: None}, kept in insertion order
+        self.particle_cells = {}  # particle -> (cx, cy, cz)
+
+    def cell_of(self, x, y, z):
+        return (int(x // self.cell_size), int(y // self.cell_size), int(z // self.cell_size))
+
+    def rebuild(self, particle_group):
+        self.cells.clear()
+        self.particle_cells.clear()
+        for particle in particle_group:
+            self.insert(particle)
+
+    def insert(self, particle):
+        cell = self.cell_of(particle.x, particle.y, particle.z)
+        self.cells.setdefault(cell, {})[particle] = None
+        self.particle_cells[particle] = cell
+
+    def update(self, particle):
+        # Move the particle to its new cell if it crossed a cell boundary
+        old_cell = self.particle_cells.get(particle)
+        new_cell = self.cell_of(particle.x, particle.y, particle.z)
+        if old_cell == new_cell:
+            return
+        if old_cell is not None:
+            del self.cells[old_cell][particle]
+            if not self.cells[old_cell]:
+                del self.cells[old_cell]
+        self.cells.setdefault(new_cell, {})[particle] = None
+        self.particle_cells[particle] = new_cell
+
+    def query(self, particle, radius):
+        """Yields every other particle closer than radius"""
+        cx, cy, cz = self.cell_of(particle.x, particle.y, particle.z)
+        reach = int(math.ceil(radius / self.cell_size))
+        radius_sq = radius * radius
+        for ix in range(cx - reach, cx + reach + 1):
+            for iy in range(cy - reach, cy + reach + 1):
+                for iz in range(cz - reach, cz + reach + 1):
+                    for other in self.cells.get((ix, iy, iz), ()):
+                        if other is particle:
+                            continue
+                        dx = other.x - particle.x
+                        dy = other.y - particle.y
+                        dz = other.z - particle.z
+                        if dx * dx + dy * dy + dz * dz < radius_sq:
+                            yield other
+
+neighbour_grid = SpatialGrid(neighbour_cell_size)
+
+def _view_property(array_name, column=None, convert=float):
+    """Property reading and writing one cell of the particle's ParticleSystem row"""
+    if column is None:
+        def getter(self):
+            return convert(getattr(self.system, array_name)[self.index])
+        def setter(self, value):
+            getattr(self.system, array_name)[self.index] = value
+    else:
+        def getter(self):
+            return convert(getattr(self.system, array_name)[self.index, column])
+        def setter(self, value):
+            getattr(self.system, array_name)[self.index, column] = value
+    return property(getter, setter)
 
 # Particle class
 class Particle:
-    def __init__(self, x, y, z, particle_type, momentum, color=(255, 255, 255)):
-        self.x = x
-        self.y = y
-        self.z = z
-        self.particle_type = particle_type
-        self.momentum = momentum
-        self.vx = momentum[0]  # Simplified: vx is the x-component of momentum
-        self.vy = momentum[1]  # Simplified: vy is the y-component of momentum
-        self.vz = momentum[2]  # Simplified: vz is the z-component of momentum
-        self.color = color
-        self.interactions = 0
-        self.knowledge_gained = 0
-        self.intent_value = 0
+    """
+    View of one particle's row in a ParticleSystem. Creating a Particle
+    appends it to the system (particle_system by default).
+    """
+    __slots__ = ("system", "index")
+    
+    x = _view_property("position", 0)
+    y = _view_property("position", 1)
+    z = _view_property("position", 2)
+    vx = _view_property("velocity", 0)
+    vy = _view_property("velocity", 1)
+    vz = _view_property("velocity", 2)
+    interactions = _view_property("interactions", convert=int)
+    knowledge_gained = _view_property("knowledge_gained")
+    intent_value = _view_property("intent_value")
+    
+    def __init__(self, x, y, z, particle_type, momentum, color=(255, 255, 255), system=None):
+        self.system = system if system is not None else particle_system
+        self.index = self.system.add(self, x, y, z, particle_type, momentum, color)
+    
+    @property
+    def momentum(self):
+        # A view of the row, so item assignment updates the system
+        return self.system.momentum[self.index]
+    
+    @momentum.setter
+    def momentum(self, value):
+        self.system.momentum[self.index] = value
+    
+    @property
+    def color(self):
+        return tuple(self.system.color[self.index].tolist())
+    
+    @color.setter
+    def color(self, value):
+        self.system.color[self.index] = value
+    
+    @property
+    def particle_type(self):
+        return self.system.particle_types[self.index]
+    
+    @particle_type.setter
+    def particle_type(self, value):
+        self.system.particle_types[self.index] = value
+        self.system.charge[self.index] = charge_code(value)
 
     def draw(self):
         projected_x = self.x / (self.z - camera_z) * width + width / 2
@@ -147,10 +539,7 @@ class Particle:
             self.vz *= -1
         
         # Get intent field value at particle position
-        x_index = min(max(0, int(self.x)), width - 1)
-        y_index = min(max(0, int(self.y)), height - 1)
-        z_index = min(max(0, int(self.z)), depth - 1)
-        self.intent_value = intent_field[z_index][y_index][x_index]
+        self.intent_value = sample_intent_field(self.x, self.y, self.z)
         
         # Change momentum based on intent and particle type
         intent_multiplier = 1.0
@@ -167,30 +556,42 @@ class Particle:
         self.vy = self.momentum[1]
         self.vz = self.momentum[2]
         
+        # Keep the neighbour index in sync with the new position
+        neighbour_grid.update(self)
+        
         # Seek knowledge from other particles
-        self.seek_knowledge(particles)
+        self.seek_knowledge()
 
-    def seek_knowledge(self, particle_group):
+    def interaction_radius(self):
+        # Adjust interaction radius based on particle type
+        if "positive" in self.particle_type:
+            return interaction_radii["positive"]  # Positive particles seek interactions
+        elif "negative" in self.particle_type:
+            return interaction_radii["negative"]  # Negative particles avoid interactions
+        return default_interaction_radius
+
+    def seek_knowledge(self, particle_group=None):
         global total_interactions
         
-        for other in particle_group:
-            if other != self:
-                dx = other.x - self.x
-                dy = other.y - self.y
-                dz = other.z - self.z
-                distance = math.sqrt(dx**2 + dy**2 + dz**2)
-                interaction_radius = 50
-                
-                # Adjust interaction radius based on particle type
-                if "positive" in self.particle_type:
-                    interaction_radius = 80  # Positive particles seek interactions
-                elif "negative" in self.particle_type:
-                    interaction_radius = 30  # Negative particles avoid interactions
-                
-                if distance < interaction_radius:
-                    self.learn_from(other)
-                    total_interactions += 1
-                    self.interactions += 1
+        interaction_radius = self.interaction_radius()
+        if particle_group is None:
+            # Only visit particles in nearby grid cells
+            neighbours = list(neighbour_grid.query(self, interaction_radius))
+        else:
+            neighbours = []
+            for other in particle_group:
+                if other != self:
+                    dx = other.x - self.x
+                    dy = other.y - self.y
+                    dz = other.z - self.z
+                    distance = math.sqrt(dx**2 + dy**2 + dz**2)
+                    if distance < interaction_radius:
+                        neighbours.append(other)
+        
+        for other in neighbours:
+            self.learn_from(other)
+            total_interactions += 1
+            self.interactions += 1
 
     def learn_from(self, other):
         # Exchange momentum and knowledge based on particle types
@@ -222,40 +623,190 @@ class Particle:
         b = int(color1[2] * (1 - alpha) + color2[2] * alpha)
         return (r, g, b)
 
+class ParticleSystem:
+    """
+    Structure-of-arrays store of the continuous simulation's particles.
+    Positions, velocities, momenta, colors and charge codes are NumPy
+    arrays, so step() moves every particle and exchanges knowledge between
+    neighbours in one batched update per frame. `particles` lists the
+    Particle view of each row in creation order.
+    """
+    def __init__(self, capacity=64):
+        self.particles = []
+        self.particle_types = []
+        self.position = np.zeros((capacity, 3))
+        self.velocity = np.zeros((capacity, 3))
+        self.momentum = np.zeros((capacity, 3))
+        self.color = np.zeros((capacity, 3), dtype=np.int64)
+        self.charge = np.zeros(capacity, dtype=np.int8)
+        self.interactions = np.zeros(capacity, dtype=np.int64)
+        self.knowledge_gained = np.zeros(capacity)
+        self.intent_value = np.zeros(capacity)
+    
+    array_names = ("position", "velocity", "momentum", "color", "charge",
+                   "interactions", "knowledge_gained", "intent_value")
+    
+    def __len__(self):
+        return len(self.particles)
+    
+    def _grow(self):
+        for name in self.array_names:
+            old = getattr(self, name)
+            new = np.zeros((2 * len(old),) + old.shape[1:], dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+    
+    def add(self, particle, x, y, z, particle_type, momentum, color):
+        """Appends a row for particle and returns its index"""
+        index = len(self.particles)
+        if index == len(self.position):
+            self._grow()
+        self.position[index] = (x, y, z)
+        self.momentum[index] = momentum
+        self.velocity[index] = momentum  # Simplified: velocity starts as the momentum
+        self.color[index] = color
+        self.charge[index] = charge_code(particle_type)
+        self.interactions[index] = 0
+        self.knowledge_gained[index] = 0
+        self.intent_value[index] = 0
+        self.particle_types.append(particle_type)
+        self.particles.append(particle)
+        return index
+    
+    def clear(self):
+        # In place, so module-level aliases of the lists stay valid
+        self.particles.clear()
+        self.particle_types.clear()
+    
+    def step(self):
+        """
+        Moves every particle through the intent field and exchanges
+        knowledge between neighbours; returns the number of interactions
+        """
+        n = len(self.particles)
+        if n == 0:
+            return 0
+        position = self.position[:n]
+        momentum = self.momentum[:n]
+        position += self.velocity[:n]
+        # Particle.move flips the velocity of particles outside the box but then
+        # replaces it with the updated momentum, so the bounce leaves no trace here
+        
+        intent = sample_intent_field_batch(position[:, 0], position[:, 1], position[:, 2])
+        self.intent_value[:n] = intent
+        momentum += (intent * learning_rate * intent_multipliers[self.charge[:n]])[:, None]
+        return self.exchange_knowledge()
+    
+    def neighbour_pairs(self, radius_sq, cell_size=neighbour_cell_size / 3):
+        """
+        (i, j) index arrays of every ordered pair with j closer to i than
+        sqrt(radius_sq[i]), found like SpatialGrid.query: particles are
+        sorted by grid cell and only compared with the particles of the
+        cells within reach. Each unordered pair of particles is measured
+        once and tested against both of their radii.
+        """
+        n = len(self.particles)
+        if n == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        cells = np.floor(self.position[:n] / cell_size).astype(np.int64)
+        reach = int(math.ceil(math.sqrt(radius_sq.max()) / cell_size))
+        # Pad by the reach so the keys of neighbouring cells never wrap around an axis
+        cells -= cells.min(axis=0) - reach
+        dims = cells.max(axis=0) + reach + 1
+        keys = (cells[:, 0] * dims[1] + cells[:, 1]) * dims[2] + cells[:, 2]
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        x, y, z = (np.ascontiguousarray(self.position[order, axis]) for axis in range(3))
+        reach_sq = radius_sq[order]
+        index = np.arange(n)
+        
+        # Cell offsets towards higher keys that lead from an occupied cell to another
+        offsets = [offset for offset in itertools.product(range(-reach, reach + 1), repeat=3) if offset >= (0, 0, 0)]
+        shifts = np.array([(dx * dims[1] + dy) * dims[2] + dz for dx, dy, dz in offsets])
+        cell_keys = np.unique(keys)
+        targets = cell_keys[:, None] + shifts[None, :]
+        found = np.minimum(np.searchsorted(cell_keys, targets), len(cell_keys) - 1)
+        live = (cell_keys[found] == targets).any(axis=0)
+        
+        pairs_i, pairs_j = [], []
+        for shift in shifts[live].tolist():
+            neighbour_keys = keys + shift
+            stop = np.searchsorted(keys, neighbour_keys, side="right")
+            if shift == 0:
+                start = index + 1  # Later particles of the same cell
+            else:
+                start = np.searchsorted(keys, neighbour_keys, side="left")
+            counts = np.maximum(stop - start, 0)
+            a = np.repeat(index, counts)
+            b = np.repeat(start - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+            dist_sq = (x[b] - x[a]) ** 2 + (y[b] - y[a]) ** 2 + (z[b] - z[a]) ** 2
+            near = dist_sq < reach_sq[a]
+            pairs_i.append(a[near])
+            pairs_j.append(b[near])
+            near = dist_sq < reach_sq[b]
+            pairs_i.append(b[near])
+            pairs_j.append(a[near])
+        return order[np.concatenate(pairs_i)], order[np.concatenate(pairs_j)]
+    
+    def exchange_knowledge(self):
+        """
+        Pulls each particle's momentum and color towards its neighbours'.
+        
+        Particle.learn_from applies one neighbour at a time; here every
+        particle sees its neighbours' state from the start of the exchange
+        and takes the same k steps towards their mean, which gives the
+        sequential result whenever the neighbours agree.
+        """
+        n = len(self.particles)
+        charge = self.charge[:n]
+        radii = np.array([interaction_radii["positive"], interaction_radii["negative"], default_interaction_radius],
+                         dtype=np.float64)
+        radius_sq = radii[charge] ** 2
+        
+        momentum = self.momentum[:n]
+        color = self.color[:n].astype(np.float64)
+        i, j = self.neighbour_pairs(radius_sq)
+        counts = np.bincount(i, minlength=n)
+        momentum_sums = np.stack([np.bincount(i, weights=momentum[j, axis], minlength=n) for axis in range(3)], axis=1)
+        color_sums = np.stack([np.bincount(i, weights=color[j, axis], minlength=n) for axis in range(3)], axis=1)
+        
+        learned = counts > 0
+        k = counts[learned]
+        modifier = learning_modifiers[charge[learned]]
+        means = 1.0 / k[:, None]
+        keep = ((1 - learning_rate * modifier) ** k)[:, None]
+        momentum[learned] = keep * momentum[learned] + (1 - keep) * momentum_sums[learned] * means
+        keep = ((1 - color_blend_rate) ** k)[:, None]
+        self.color[:n][learned] = (keep * color[learned] + (1 - keep) * color_sums[learned] * means).astype(np.int64)
+        self.knowledge_gained[:n][learned] += modifier * k
+        self.interactions[:n] += counts
+        self.velocity[:n] = momentum
+        return int(counts.sum())
+
+particle_system = ParticleSystem()
+particles = particle_system.particles
+
 def update_statistics():
     global positive_particles, negative_particles, neutral_particles, average_momentum, simulation_complexity
     
-    # Reset counters
-    positive_particles = 0
-    negative_particles = 0
-    neutral_particles = 0
-    total_momentum = [0, 0, 0]
-    
-    # Calculate statistics
-    for particle in particles:
-        if "positive" in particle.particle_type:
-            positive_particles += 1
-        elif "negative" in particle.particle_type:
-            negative_particles += 1
-        else:
-            neutral_particles += 1
-            
-        total_momentum[0] += abs(particle.momentum[0])
-        total_momentum[1] += abs(particle.momentum[1])
-        total_momentum[2] += abs(particle.momentum[2])
+    # Count charges and sum |momentum| straight from the particle arrays
+    n = len(particle_system)
+    positive_particles, negative_particles, neutral_particles = (
+        np.bincount(particle_system.charge[:n], minlength=3).tolist())
     
     # Calculate average momentum
     if particles:
-        average_momentum = [m / len(particles) for m in total_momentum]
+        average_momentum = (np.abs(particle_system.momentum[:n]).sum(axis=0) / n).tolist()
     else:
         average_momentum = [0, 0, 0]
     
     # Calculate a basic complexity measure based on particle interactions and knowledge
-    interaction_diversity = len(set([p.interactions for p in particles])) if particles else 0
-    knowledge_diversity = len(set([round(p.knowledge_gained, 2) for p in particles])) if particles else 0
+    interaction_diversity = len(np.unique(particle_system.interactions[:n])) if particles else 0
+    knowledge_diversity = len(set([round(k, 2) for k in particle_system.knowledge_gained[:n].tolist()])) if particles else 0
     simulation_complexity = (interaction_diversity + knowledge_diversity) / 2
+    field = intent_field_stats()
     
-    return {
+    stats = {
         "timestamp": datetime.now().isoformat(),
         "positive_particles": positive_particles,
         "negative_particles": negative_particles,
@@ -266,8 +817,13 @@ def update_statistics():
         "average_momentum_y": average_momentum[1],
         "average_momentum_z": average_momentum[2],
         "simulation_complexity": simulation_complexity,
-        "intent_field_energy": sum(sum(sum(abs(v) for v in row) for row in plane) for plane in intent_field) / (width * height * depth)
+        "intent_field_energy": field["mean_abs"],
+        "intent_field_min": field["min"],
+        "intent_field_max": field["max"]
     }
+    if field["histogram"] is not None:
+        stats["intent_field_histogram"] = field["histogram"]
+    return stats
 
 def save_simulation_data(stats):
     # Generate a filename with timestamp
@@ -302,155 +858,448 @@ def save_simulation_data(stats):
     
     print(f"Simulation data saved to {data_file}")
     
-    # Also update a summary file for the day
-    summary_file = os.path.join(data_dir, "summary.json")
+    # Also append the stats to the summary log
+    append_summary(os.path.join(data_dir, SUMMARY_LOG_NAME), stats)
+
+def latest_checkpoint(directory=None):
+    """Path of the newest checkpoint in directory, or None"""
+    directory = directory or checkpoint_dir
+    if not os.path.isdir(directory):
+        return None
+    names = sorted(name for name in os.listdir(directory)
+                   if name.startswith("checkpoint_") and not name.endswith(".tmp"))
+    return os.path.join(directory, names[-1]) if names else None
+
+def prune_checkpoints(directory, keep):
+    names = sorted(name for name in os.listdir(directory)
+                   if name.startswith("checkpoint_") and not name.endswith(".tmp"))
+    for name in names[:-keep] if keep > 0 else []:
+        shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+
+def save_checkpoint(frame_count, directory=None):
+    """
+    Writes the full simulation state to a new checkpoint directory: the
+    intent field as a .npy file that restore_checkpoint maps back into
+    memory, the particles as columns of particles.npz, and the counters,
+    field settings and random stream states in state.json
+    """
+    directory = directory or checkpoint_dir
+    ensure_intent_field()
+    os.makedirs(directory, exist_ok=True)
+    name = f"checkpoint_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{frame_count:08d}"
+    path = os.path.join(directory, name)
+    temp_path = path + ".tmp"
+    shutil.rmtree(temp_path, ignore_errors=True)
+    os.makedirs(temp_path)
+    
+    state = {
+        "frame_count": frame_count,
+        "total_interactions": total_interactions,
+        "field_mode": intent_field_mode,
+        "field_scale": intent_field_scale,
+        "field_shape": [field_depth, field_height, field_width],
+        "field_rng": field_rng.bit_generator.state,
+        "particle_rng": particle_rng.getstate()
+    }
+    if lazy_intent_field is not None:
+        cells = lazy_intent_field.cells
+        np.savez(os.path.join(temp_path, "lazy_field.npz"),
+                 indices=np.fromiter(cells, dtype=np.int64, count=len(cells)),
+                 values=np.fromiter((cell[0] for cell in cells.values()), dtype=np.float64, count=len(cells)),
+                 frames=np.fromiter((cell[1] for cell in cells.values()), dtype=np.int64, count=len(cells)))
+        state["lazy_field"] = {
+            "seed": lazy_intent_field.seed,
+            "frame": lazy_intent_field.frame,
+            "abs_sum": lazy_intent_field.abs_sum,
+            "min": lazy_intent_field.min,
+            "max": lazy_intent_field.max,
+            "idle_frames": lazy_intent_field.idle_frames,
+            "rng": lazy_intent_field.rng.getstate()
+        }
+    else:
+        # np.save writes the field's buffer straight to the file, without a copy
+        np.save(os.path.join(temp_path, "intent_field.npy"), intent_field)
+    
+    n = len(particle_system)
+    np.savez(os.path.join(temp_path, "particles.npz"),
+             position=particle_system.position[:n],
+             velocity=particle_system.velocity[:n],
+             momentum=particle_system.momentum[:n],
+             color=particle_system.color[:n].astype(np.uint8),
+             particle_type=np.array(particle_system.particle_types, dtype=str),
+             interactions=particle_system.interactions[:n],
+             knowledge_gained=particle_system.knowledge_gained[:n],
+             intent_value=particle_system.intent_value[:n])
+    with open(os.path.join(temp_path, "state.json"), 'w') as f:
+        json.dump(state, f)
+    
+    # The checkpoint only appears under its final name once it is complete
+    os.replace(temp_path, path)
+    prune_checkpoints(directory, checkpoint_keep)
+    return path
+
+def restore_checkpoint(path):
+    """
+    Restores the state written by save_checkpoint and returns its frame
+    count. A dense field is mapped copy-on-write, so restoring does not
+    read it up front and the run never modifies the checkpoint.
+    """
+    global total_interactions, intent_field_mode, intent_field_scale, intent_field_dtype
+    global intent_field, field_noise, lazy_intent_field, field_version
+    
+    with open(os.path.join(path, "state.json"), 'r') as f:
+        state = json.load(f)
+    field_version += 1
     
-    # Load existing summary if it exists
-    summary_data = []
-    if os.path.exists(summary_file):
-        try:
-            with open(summary_file, 'r') as f:
-                summary_data = json.load(f)
-        except:
-            summary_data = []
+    intent_field_mode = state["field_mode"]
+    intent_field_scale = state["field_scale"]
+    shape = update_field_dimensions()
+    if list(shape) != state["field_shape"]:
+        raise ValueError(f"Checkpoint field shape {state['field_shape']} does not match scale {intent_field_scale}")
+    field_rng.bit_generator.state = state["field_rng"]
+    version, internal_state, gauss_next = state["particle_rng"]
+    particle_rng.setstate((version, tuple(internal_state), gauss_next))
     
-    # Add latest stats to summary
-    summary_data.append(stats)
+    if intent_field_mode == "lazy":
+        intent_field = field_noise = None
+        lazy_state = state["lazy_field"]
+        lazy_intent_field = LazyIntentField(shape, intent_fluctuation_rate, seed=lazy_state["seed"],
+                                            idle_frames=lazy_state.get("idle_frames", 10000))
+        lazy_intent_field.frame = lazy_state["frame"]
+        lazy_intent_field.abs_sum = lazy_state["abs_sum"]
+        lazy_intent_field.min = lazy_state.get("min", math.inf)
+        lazy_intent_field.max = lazy_state.get("max", -math.inf)
+        version, internal_state, gauss_next = lazy_state["rng"]
+        lazy_intent_field.rng.setstate((version, tuple(internal_state), gauss_next))
+        with np.load(os.path.join(path, "lazy_field.npz")) as cells:
+            lazy_intent_field.cells = {
+                index: [value, frame] for index, value, frame in
+                zip(cells["indices"].tolist(), cells["values"].tolist(), cells["frames"].tolist())
+            }
+    else:
+        lazy_intent_field = None
+        intent_field = np.load(os.path.join(path, "intent_field.npy"), mmap_mode="c")
+        intent_field_dtype = intent_field.dtype.type
+        field_noise = np.empty(shape, dtype=np.float32)
     
-    # Save updated summary
-    with open(summary_file, 'w') as f:
-        json.dump(summary_data, f, indent=2)
+    with np.load(os.path.join(path, "particles.npz")) as columns:
+        columns = {name: columns[name].tolist() for name in columns.files}
+    particle_system.clear()
+    for i in range(len(columns["position"])):
+        x, y, z = columns["position"][i]
+        particle = Particle(x, y, z, str(columns["particle_type"][i]), columns["momentum"][i],
+                            tuple(columns["color"][i]))
+        particle.vx, particle.vy, particle.vz = columns["velocity"][i]
+        particle.interactions = columns["interactions"][i]
+        particle.knowledge_gained = columns["knowledge_gained"][i]
+        particle.intent_value = columns["intent_value"][i]
+    neighbour_grid.rebuild(particles)
+    total_interactions = state["total_interactions"]
+    return state["frame_count"]
 
-def create_particle():
+def create_particle(rng=None):
+    rng = rng or particle_rng
+    if experimental_pool is None and simulation_pool is None:
+        load_momentum_pools()
     # Determine particle type and color
-    intent_value = random.uniform(-1, 1)
+    intent_value = rng.uniform(-1, 1)
     
     if intent_value > 0.3:  # Positive intent
-        particle_type = "positive_" + random.choice(["electron", "proton", "boson"])
+        particle_type = "positive_" + rng.choice(["electron", "proton", "boson"])
         color = (0, 255, 0)  # Green for positive
     elif intent_value < -0.3:  # Negative intent
-        particle_type = "negative_" + random.choice(["electron", "proton", "boson"])
+        particle_type = "negative_" + rng.choice(["electron", "proton", "boson"])
         color = (255, 0, 0)  # Red for negative
     else:  # Neutral intent
-        particle_type = "neutral_" + random.choice(["neutron", "photon", "neutrino"])
+        particle_type = "neutral_" + rng.choice(["neutron", "photon", "neutrino"])
         color = (0, 0, 255)  # Blue for neutral
     
     # Generate momentum from data or random values
-    if random.random() < 0.7 and (experimental_data is not None or simulation_data is not None):
-        if random.random() < 0.5 and experimental_data is not None:
-            index = random.randint(0, len(experimental_data) - 1)
-            momentum = experimental_data[["px", "py", "pz"]].iloc[index].tolist()
-        elif simulation_data is not None:
-            index = random.randint(0, len(simulation_data) - 1)
-            momentum = simulation_data[["px", "py", "pz"]].iloc[index].tolist()
+    if rng.random() < 0.7 and (experimental_pool or simulation_pool):
+        if rng.random() < 0.5 and experimental_pool:
+            momentum = experimental_pool.draw(rng)
+        elif simulation_pool:
+            momentum = simulation_pool.draw(rng)
         else:
-            momentum = [random.uniform(-2, 2), random.uniform(-2, 2), random.uniform(-2, 2)]
+            momentum = [rng.uniform(-2, 2), rng.uniform(-2, 2), rng.uniform(-2, 2)]
     else:
-        momentum = [random.uniform(-2, 2), random.uniform(-2, 2), random.uniform(-2, 2)]
+        momentum = [rng.uniform(-2, 2), rng.uniform(-2, 2), rng.uniform(-2, 2)]
     
     # Create particle
-    x, y, z = random.uniform(0, width), random.uniform(0, height), random.uniform(0, depth-1)
+    x, y, z = rng.uniform(0, width), rng.uniform(0, height), rng.uniform(0, depth-1)
     return Particle(x, y, z, particle_type, momentum, color)
 
-# Main loop
-running = True
-try:
-    print("Starting IntentSim - a continuous universe simulation")
-    print("Data will be saved periodically to the 'data' directory")
+def init_display(headless=False):
+    """Imports pygame and opens the window (an off-screen surface when headless)"""
+    global pygame, screen
+    if headless:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame as pygame_module
+    pygame = pygame_module
+    screen = pygame.display.set_mode((width, height))
+    pygame.display.set_caption("IntentSim - Continuous Universe Simulation")
+
+def project_particles():
+    """
+    Particle.draw's perspective projection for every particle at once.
+    Returns the particle indices, screen x, y and radius of the particles
+    in front of the camera that reach the screen, ordered far to near.
+    """
+    n = len(particle_system)
+    position = particle_system.position[:n]
+    depth_offset = position[:, 2] - camera_z
+    index = np.flatnonzero(depth_offset > 0)
+    depth_offset = depth_offset[index]
+    screen_x = (position[index, 0] / depth_offset * width + width / 2).astype(np.int64)
+    screen_y = (position[index, 1] / depth_offset * height + height / 2).astype(np.int64)
+    radius = (particle_radius / depth_offset * width).astype(np.int64)
     
-    stats_history = []
-    frame_count = 0
+    on_screen = ((screen_x + radius >= 0) & (screen_x - radius < width) &
+                 (screen_y + radius >= 0) & (screen_y - radius < height))
+    order = np.argsort(-depth_offset[on_screen], kind="stable")
+    return (index[on_screen][order], screen_x[on_screen][order],
+            screen_y[on_screen][order], radius[on_screen][order])
+
+def draw_particles():
+    """
+    Draws all visible particles far to near, so nearer particles cover
+    farther ones. Projection and off-screen culling are vectorized; each
+    remaining particle is still one pygame.draw.circle call.
+    """
+    index, screen_x, screen_y, radius = project_particles()
+    draw_circle = pygame.draw.circle
+    for color, x, y, r in zip(particle_system.color[index].tolist(), screen_x.tolist(),
+                              screen_y.tolist(), radius.tolist()):
+        draw_circle(screen, color, (x, y), r)
+
+def render_frame():
+    screen.fill((0, 0, 0))
+    draw_particles()
+    pygame.display.flip()
+
+def save_frame_snapshot(frame_number):
+    frames_dir = os.path.join(current_data_dir, "frames")
+    os.makedirs(frames_dir, exist_ok=True)
+    pygame.image.save(screen, os.path.join(frames_dir, f"frame_{frame_number:08d}.png"))
+
+def throughput_report(frames, particle_updates, elapsed):
+    return {
+        "frames": frames,
+        "particle_updates": particle_updates,
+        "elapsed_seconds": elapsed,
+        "frames_per_second": frames / elapsed if elapsed > 0 else 0,
+        "particle_updates_per_second": particle_updates / elapsed if elapsed > 0 else 0
+    }
+
+def run(headless=False, render_every=None, max_frames=None, frame_delay=10, seed=None, resume=None,
+        engine="batched"):
+    """
+    Runs the continuous simulation and returns a throughput report.
     
-    while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    running = False
-        
-        # Update the display
-        screen.fill((0, 0, 0))
-        
-        # Update intent field with fluctuations
-        for z in range(depth):
-            for y in range(height):
-                for x in range(width):
-                    intent_field[z][y][x] += random.uniform(-intent_fluctuation_rate, intent_fluctuation_rate)
-                    intent_field[z][y][x] = max(min(intent_field[z][y][x], 1), -1)
-        
-        # Create new particles based on intent field fluctuations
-        if len(particles) < max_particles and random.random() < 0.05:
-            particles.append(create_particle())
-        
-        # Move and draw particles
-        for particle in particles:
-            particle.move()
-            particle.draw()
-        
-        # Update display
-        pygame.display.flip()
+    Headless runs never import pygame and never sleep between frames. With
+    render_every=N they draw every Nth frame off-screen and save it as a PNG
+    snapshot; windowed runs draw every Nth frame to the window instead.
+    Passing a seed reseeds the field and particle streams first, so the
+    same seed replays the same particle trajectories. resume is a
+    checkpoint path, or "latest" for the newest one in checkpoint_dir, to
+    continue from; a checkpoint is written every checkpoint_interval
+    seconds and when the run ends cleanly.
+    
+    engine="batched" advances all particles with one ParticleSystem.step
+    per frame; engine="objects" calls Particle.move on each particle in
+    turn, so later particles see the already updated earlier ones.
+    """
+    global date_str, current_data_dir, last_save_time, total_interactions
+    
+    if engine not in ("batched", "objects"):
+        raise ValueError(f"Unknown particle engine: {engine}")
+    if seed is not None:
+        seed_random_streams(seed)
+    if render_every is None:
+        render_every = 0 if headless else 1
+    if not headless:
+        render_every = max(1, render_every)
+    rendering = render_every > 0
+    if rendering:
+        init_display(headless)
+    
+    running = True
+    stats_history = []
+    frame_count = 0  # Continues from a restored checkpoint
+    session_frames = 0  # Frames run by this call, for the throughput report
+    particle_updates = 0
+    if resume is not None:
+        checkpoint = latest_checkpoint() if resume == "latest" else resume
+        if checkpoint is None:
+            print("No checkpoint found, starting a fresh run")
+        else:
+            restore_start = time.perf_counter()
+            frame_count = restore_checkpoint(checkpoint)
+            print(f"Restored {checkpoint} (frame {frame_count}, {len(particles)} particles) "
+                  f"in {time.perf_counter() - restore_start:.2f}s")
+    ensure_intent_field()
+    if engine == "objects":
+        neighbour_grid.rebuild(particles)
+    last_checkpoint_time = time.time()
+    run_start = time.perf_counter()
+    try:
+        print("Starting IntentSim - a continuous universe simulation" + (" (headless)" if headless else ""))
+        print("Data will be saved periodically to the 'data' directory")
         
-        # Update statistics every 100 frames
-        frame_count += 1
-        if frame_count % 100 == 0:
-            stats = update_statistics()
-            stats_history.append(stats)
+        while running:
+            if not headless:
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        running = False
+                    if event.type == pygame.KEYDOWN:
+                        if event.key == pygame.K_ESCAPE:
+                            running = False
             
-            # Print current stats
-            print(f"Time: {stats['timestamp']}")
-            print(f"Particles: {stats['total_particles']} (+ {stats['positive_particles']}, - {stats['negative_particles']}, n {stats['neutral_particles']})")
-            print(f"Interactions: {stats['total_interactions']}")
-            print(f"Complexity: {stats['simulation_complexity']:.2f}")
-            print("---")
-        
-        # Save data periodically
-        current_time = time.time()
-        if current_time - last_save_time > save_interval:
-            last_save_time = current_time
+            # Update intent field with fluctuations, summarizing it on the way into a statistics frame
+            fluctuate_intent_field(summarize=(frame_count + 1) % stats_interval == 0)
+            
+            # Create new particles based on intent field fluctuations
+            if len(particles) < max_particles and particle_rng.random() < 0.05:
+                particle = create_particle()  # Joins particle_system and so particles
+                if engine == "objects":
+                    neighbour_grid.insert(particle)
             
-            # Save current simulation state
-            if stats_history:
-                save_simulation_data(stats_history[-1])
+            # Move particles
+            if engine == "batched":
+                total_interactions += particle_system.step()
+            else:
+                for particle in particles:
+                    particle.move()
+            particle_updates += len(particles)
+            frame_count += 1
+            session_frames += 1
             
-            # Check if we've crossed to a new day
-            now = datetime.now()
-            new_date_str = now.strftime("%Y%m%d")
+            # Draw particles
+            if rendering and frame_count % render_every == 0:
+                render_frame()
+                if headless:
+                    save_frame_snapshot(frame_count)
             
-            # If it's a new day, create a new directory
-            if new_date_str != date_str:
-                date_str = new_date_str
-                current_data_dir = os.path.join(data_dir, date_str)
-                os.makedirs(current_data_dir, exist_ok=True)
+            # Update statistics every stats_interval frames
+            if frame_count % stats_interval == 0:
+                stats = update_statistics()
+                stats_history.append(stats)
+                report = throughput_report(session_frames, particle_updates, time.perf_counter() - run_start)
                 
-                # Save a daily summary
-                daily_summary_file = os.path.join(current_data_dir, "daily_summary.json")
-                with open(daily_summary_file, 'w') as f:
-                    json.dump(stats_history, f, indent=2)
+                # Print current stats
+                print(f"Time: {stats['timestamp']}")
+                print(f"Particles: {stats['total_particles']} (+ {stats['positive_particles']}, - {stats['negative_particles']}, n {stats['neutral_particles']})")
+                print(f"Interactions: {stats['total_interactions']}")
+                print(f"Complexity: {stats['simulation_complexity']:.2f}")
+                print(f"Throughput: {report['frames_per_second']:.1f} fps, {report['particle_updates_per_second']:.0f} particle updates/s")
+                print("---")
+            
+            # Save data periodically
+            current_time = time.time()
+            if checkpoint_interval and current_time - last_checkpoint_time > checkpoint_interval:
+                last_checkpoint_time = current_time
+                print(f"Checkpoint saved to {save_checkpoint(frame_count)}")
+            
+            if current_time - last_save_time > save_interval:
+                last_save_time = current_time
                 
-                # Reset the stats history for the new day
-                stats_history = []
+                # Save current simulation state
+                if stats_history:
+                    save_simulation_data(stats_history[-1])
                 
-                print(f"Started new day: {date_str}")
+                # Check if we've crossed to a new day
+                now = datetime.now()
+                new_date_str = now.strftime("%Y%m%d")
+                
+                # If it's a new day, create a new directory
+                if new_date_str != date_str:
+                    date_str = new_date_str
+                    current_data_dir = os.path.join(data_dir, date_str)
+                    os.makedirs(current_data_dir, exist_ok=True)
+                    
+                    # Save a daily summary
+                    daily_summary_file = os.path.join(current_data_dir, "daily_summary.json")
+                    with open(daily_summary_file, 'w') as f:
+                        json.dump(stats_history, f, indent=2)
+                    
+                    # Reset the stats history for the new day
+                    stats_history = []
+                    
+                    print(f"Started new day: {date_str}")
+            
+            if max_frames is not None and frame_count >= max_frames:
+                running = False
+            
+            # Add a small delay to control the simulation speed
+            if not headless and frame_delay:
+                pygame.time.delay(frame_delay)
+            
+    except KeyboardInterrupt:
+        print("Simulation interrupted by user.")
+        running = False  # A deliberate stop: checkpoint and exit instead of restarting
+    except Exception as e:
+        print(f"Error in simulation: {e}")
+    finally:
+        # Save final simulation state
+        if particles:
+            stats = update_statistics()
+            save_simulation_data(stats)
+        if checkpoint_interval and not running:
+            print(f"Checkpoint saved to {save_checkpoint(frame_count)}")
         
-        # Add a small delay to control the simulation speed
-        pygame.time.delay(10)
+        if pygame is not None:
+            pygame.quit()
+        print("Simulation ended. Data has been saved.")
         
-except KeyboardInterrupt:
-    print("Simulation interrupted by user.")
-except Exception as e:
-    print(f"Error in simulation: {e}")
-finally:
-    # Save final simulation state
-    if particles:
-        stats = update_statistics()
-        save_simulation_data(stats)
+        report = throughput_report(session_frames, particle_updates, time.perf_counter() - run_start)
+        print(f"Ran {report['frames']} frames in {report['elapsed_seconds']:.1f}s: "
+              f"{report['frames_per_second']:.1f} fps, {report['particle_updates_per_second']:.0f} particle updates/s")
+        
+        # Auto-restart if the simulation ends unexpectedly
+        if running:  # If we didn't explicitly quit
+            print("Unexpected simulation end. Restarting in 5 seconds...")
+            time.sleep(5)
+            argv = sys.argv
+            if checkpoint_interval and "--resume" not in argv and latest_checkpoint() is not None:
+                argv = argv + ["--resume"]  # Continue from the last checkpoint instead of a fresh field
+            os.execv(sys.executable, ['python'] + argv)
     
-    pygame.quit()
-    print("Simulation ended. Data has been saved.")
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='IntentSim continuous universe simulation.')
+    parser.add_argument('--headless', action='store_true', help='Run without a window, pygame or per-frame delay')
+    parser.add_argument('--render-every', type=int, default=None,
+                        help='Draw every Nth frame (headless: save it as a PNG snapshot, 0 disables)')
+    parser.add_argument('--frames', type=int, default=None, help='Stop after this many frames')
+    parser.add_argument('--max-particles', type=int, default=max_particles, help='Particle cap (default: 300)')
+    parser.add_argument('--seed', type=int, default=None, help='Seed for a reproducible run')
+    parser.add_argument('--resume', nargs='?', const='latest', default=None,
+                        help='Continue from a checkpoint directory (default: the newest checkpoint)')
+    parser.add_argument('--checkpoint-interval', type=float, default=checkpoint_interval,
+                        help='Seconds between checkpoints, 0 disables them (default: 600)')
+    parser.add_argument('--checkpoint-dir', default=checkpoint_dir, help='Checkpoint directory (default: data/checkpoints)')
+    parser.add_argument('--engine', choices=('batched', 'objects'), default='batched',
+                        help='Advance particles in one batched array step or one Particle at a time (default: batched)')
+    parser.add_argument('--field-scale', type=float, default=intent_field_scale,
+                        help='Intent field cells per screen unit; below 1 keeps a coarser, smaller field (default: 1)')
+    parser.add_argument('--field-mode', choices=('dense', 'lazy'), default=intent_field_mode,
+                        help='Allocate the whole intent field or only the cells particles sample (default: dense)')
+    parser.add_argument('--field-histogram-bins', type=int, default=0,
+                        help='Add a histogram of intent field values with this many bins to the statistics')
+    parser.add_argument('--profile-startup', action='store_true', help='Print the import time of each module and exit')
     
-    # Auto-restart if the simulation ends unexpectedly
-    if running:  # If we didn't explicitly quit
-        print("Unexpected simulation end. Restarting in 5 seconds...")
-        time.sleep(5)
-        os.execv(sys.executable, ['python'] + sys.argv)
+    args = parser.parse_args()
+    if startup_timer is not None:
+        startup_timer.report()
+        sys.exit(0)
+    if args.field_scale <= 0:
+        parser.error("--field-scale must be positive")
+    max_particles = args.max_particles
+    intent_field_scale = args.field_scale
+    intent_field_mode = args.field_mode
+    field_histogram_bins = args.field_histogram_bins
+    checkpoint_interval = args.checkpoint_interval
+    checkpoint_dir = args.checkpoint_dir
+    run(headless=args.headless, render_every=args.render_every, max_frames=args.frames, seed=args.seed,
+        resume=args.resume, engine=args.engine)
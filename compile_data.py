@@ -1,8 +1,19 @@
 
 import os
+import sys
 import json
+import hashlib
 import argparse
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+from summary_log import SUMMARY_LOG_NAME, SUMMARY_SNAPSHOT_NAME, record_run
+from columnar_output import is_sidecar
+
+# Incremental (streaming) compile output and the manifest of compiled inputs
+STREAM_OUTPUT_NAME = "simulation_compiled.jsonl"
+MANIFEST_NAME = "compile_manifest.json"
 
 def compile_simulation_data(source_dir, output_dir):
     """
@@ -21,7 +32,7 @@ def compile_simulation_data(source_dir, output_dir):
         os.makedirs(output_dir)
     
     # Get all JSON files in the source directory
-    json_files = [f for f in os.listdir(source_dir) if f.endswith('.json')]
+    json_files = [f for f in os.listdir(source_dir) if f.endswith('.json') and not is_sidecar(f)]
     
     if not json_files:
         print(f"No JSON files found in {source_dir}")
@@ -75,15 +86,18 @@ def compile_simulation_data(source_dir, output_dir):
         json.dump(simulation_data, f, indent=2)
     
     print(f"Compiled data saved to {output_file}")
-    
-    # Update summary file
-    summary_file = os.path.join(output_dir, "summary.json")
+    update_summary(output_dir, timestamp)
+
+def update_summary(output_dir, timestamp):
+    """Records the latest compile in the output directory's summary log and summary.json"""
     summary_data = {
         "timestamp": timestamp,
         "simulations": ["compiled_simulation"],
         "latest_run": timestamp
     }
     
+    # summary.json holds only the latest record, so reading it stays cheap
+    summary_file = os.path.join(output_dir, SUMMARY_SNAPSHOT_NAME)
     if os.path.exists(summary_file):
         try:
             with open(summary_file, 'r') as f:
@@ -95,15 +109,127 @@ def compile_simulation_data(source_dir, output_dir):
         except json.JSONDecodeError:
             pass
     
-    with open(summary_file, 'w') as f:
-        json.dump(summary_data, f, indent=2)
+    record_run(output_dir, summary_data)
+    
+    print(f"Summary log updated at {os.path.join(output_dir, SUMMARY_LOG_NAME)}")
+
+def read_input_file(file_path):
+    """
+    Reads one input file and returns (sha256, items, error), where items is
+    the list of records it contributes to the compiled data
+    """
+    with open(file_path, 'rb') as f:
+        raw = f.read()
+    digest = hashlib.sha256(raw).hexdigest()
+    try:
+        data = json.loads(raw)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        return digest, [], str(e)
+    if isinstance(data, dict):
+        return digest, [data], None
+    if isinstance(data, list):
+        return digest, data, None
+    return digest, [], None
+
+def load_manifest(output_dir):
+    manifest_file = os.path.join(output_dir, MANIFEST_NAME)
+    try:
+        with open(manifest_file, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"inputs": {}, "output_size": 0}
+
+def save_manifest(output_dir, manifest):
+    manifest_file = os.path.join(output_dir, MANIFEST_NAME)
+    with open(manifest_file + ".tmp", 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(manifest_file + ".tmp", manifest_file)
+
+def compile_simulation_data_stream(source_dir, output_dir, workers=None, chunk_size=64):
+    """
+    Incrementally compiles simulation data into a JSON Lines file.
+    
+    Every record of the "data" list is written as one line of
+    simulation_compiled.jsonl, so memory use is bounded by one chunk of
+    input files. A manifest of each input's mtime, size and sha256 lets
+    later runs append only new files; if a compiled input was changed or
+    deleted, or a previous compile was interrupted, the output is rebuilt
+    from scratch.
     
-    print(f"Summary file updated at {summary_file}")
+    Args:
+        source_dir (str): Path to source directory containing simulation data files
+        output_dir (str): Path to output directory where compiled data will be saved
+        workers (int): Threads used to read and parse input files
+        chunk_size (int): Input files parsed per batch
+    """
+    if not os.path.exists(source_dir):
+        print(f"Error: Source directory {source_dir} does not exist.")
+        return
+    os.makedirs(output_dir, exist_ok=True)
+    
+    output_file = os.path.join(output_dir, STREAM_OUTPUT_NAME)
+    skipped = {"simulation_config.json", MANIFEST_NAME, SUMMARY_SNAPSHOT_NAME}  # Outputs that may share source_dir
+    inputs = {}
+    for file_name in sorted(os.listdir(source_dir)):
+        if file_name.endswith('.json') and file_name not in skipped and not is_sidecar(file_name):
+            stat = os.stat(os.path.join(source_dir, file_name))
+            inputs[file_name] = {"mtime": stat.st_mtime, "size": stat.st_size}
+    
+    manifest = load_manifest(output_dir)
+    compiled = manifest["inputs"]
+    # A size mismatch means a compile was interrupted before its manifest was saved
+    output_size = os.path.getsize(output_file) if os.path.exists(output_file) else -1
+    rebuild = output_size != manifest["output_size"] or any(name not in inputs for name in compiled)
+    
+    # Inputs whose mtime or size changed may still hold the same content
+    touched = [name for name in inputs if name in compiled and
+               (inputs[name]["mtime"], inputs[name]["size"]) != (compiled[name]["mtime"], compiled[name]["size"])]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        if touched and not rebuild:
+            paths = [os.path.join(source_dir, name) for name in touched]
+            for name, (digest, _, _) in zip(touched, executor.map(read_input_file, paths)):
+                if digest != compiled[name]["sha256"]:
+                    rebuild = True
+                    break
+                compiled[name].update(inputs[name])
+        
+        if rebuild:
+            compiled = manifest["inputs"] = {}
+            pending = list(inputs)
+            write_file, mode = output_file + ".tmp", 'w'
+        else:
+            pending = [name for name in inputs if name not in compiled]
+            write_file, mode = output_file, 'a'
+        
+        with open(write_file, mode) as out:
+            for start in range(0, len(pending), chunk_size):
+                names = pending[start:start + chunk_size]
+                paths = [os.path.join(source_dir, name) for name in names]
+                for name, (digest, items, error) in zip(names, executor.map(read_input_file, paths)):
+                    if error:
+                        print(f"Error processing {name}: {error}")
+                    for item in items:
+                        out.write(json.dumps(item) + "\n")
+                    compiled[name] = dict(inputs[name], sha256=digest)
+            manifest["output_size"] = out.tell()
+    if rebuild:
+        os.replace(write_file, output_file)
+    
+    save_manifest(output_dir, manifest)
+    action = "Rebuilt" if rebuild else "Appended to"
+    print(f"{action} {output_file}: {len(pending)} input files compiled, {len(inputs) - len(pending)} unchanged")
+    update_summary(output_dir, datetime.now().strftime("%Y%m%d_%H%M%S"))
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Compile simulation data files into a single JSON file.')
     parser.add_argument('source_dir', help='Source directory containing simulation data files')
     parser.add_argument('--output_dir', default='./data', help='Output directory for compiled data (default: ./data)')
+    parser.add_argument('--stream', action='store_true',
+                        help=f'Incrementally compile into {STREAM_OUTPUT_NAME}, skipping unchanged inputs')
+    parser.add_argument('--workers', type=int, default=None, help='Threads for parsing input files (--stream only)')
     
     args = parser.parse_args()
-    compile_simulation_data(args.source_dir, args.output_dir)
+    if args.stream:
+        compile_simulation_data_stream(args.source_dir, args.output_dir, workers=args.workers)
+    else:
+        compile_simulation_data(args.source_dir, args.output_dir)
@@ -4,8 +4,6 @@ import yaml
 import os
 from datetime import datetime
 import logging
-import pandas as pd
-import matplotlib.pyplot as plt
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -50,6 +48,10 @@ class IntentAgent:
     def create_chart(self):
         print("📊 Creating and saving new chart from latest simulation data...")
         try:
+            # Charting dependencies are only loaded by the task that needs them
+            import pandas as pd
+            import matplotlib.pyplot as plt
+            
             data_path = "data/simulation_output.csv"
             if not os.path.exists(data_path):
                 raise FileNotFoundError(f"Data file not found: {data_path}")
@@ -1,12 +1,80 @@
-
 import os
+import sys
 import shutil
 import json
+import argparse
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
 from fpdf import FPDF
 
-def organize_files(data_dir):
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+from columnar_output import is_sidecar
+
+# Per-directory index of organized files; not a .json file so it is never organized itself
+STATE_NAME = ".organize_state"
+TRANSFER_MODES = ("copy", "link", "move")
+
+def load_state(data_dir):
+    try:
+        with open(os.path.join(data_dir, STATE_NAME), 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_state(data_dir, state):
+    state_file = os.path.join(data_dir, STATE_NAME)
+    with open(state_file + ".tmp", 'w') as f:
+        json.dump(state, f, indent=2)
+    os.replace(state_file + ".tmp", state_file)
+
+def transfer_file(src_path, dest_path, transfer="copy"):
+    """
+    Places src_path at dest_path by copying, hard-linking or renaming it.
+    Returns the action performed: "Moved", "Linked" or "Copied".
+    """
+    if transfer == "move":
+        os.replace(src_path, dest_path)
+        return "Moved"
+    if transfer == "link":
+        temp_path = dest_path + ".tmp"
+        try:
+            if os.path.lexists(temp_path):
+                os.remove(temp_path)
+            os.link(src_path, temp_path)
+            os.replace(temp_path, dest_path)
+            return "Linked"
+        except OSError:
+            pass  # Cross-device or unsupported: fall back to copying
+    shutil.copy(src_path, dest_path)
+    return "Copied"
+
+def is_organized(entry, stat):
+    """Whether a state index entry still describes the file and its outputs"""
+    return (entry is not None and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime
+            and all(os.path.exists(path) for path in entry["outputs"]))
+
+def organize_files(data_dir, incremental=False, transfer="copy", executor=None):
+    """
+    Files each simulation JSON in data_dir under <sim_type>/<date>/ and
+    renders a PDF report next to it.
+    
+    With incremental=True, files whose size and mtime match the state
+    index and whose outputs still exist are skipped. transfer is "copy",
+    "link" (hard link, falling back to a copy) or "move". PDFs are
+    rendered in `executor` (e.g. a ProcessPoolExecutor) when one is given.
+    """
+    if transfer not in TRANSFER_MODES:
+        raise ValueError(f"Unknown transfer mode: {transfer}")
+    state = load_state(data_dir) if incremental else {}
+    reports = []  # (file_name, stat, dest_path, pdf_path)
+    skipped = 0
+    
     for file_name in os.listdir(data_dir):
+        if file_name == STATE_NAME:
+            continue
+        if is_sidecar(file_name):
+            print(f'Skipping result sidecar: {file_name}')
+            continue
         if file_name.endswith(".json"):
             parts = file_name.split('_')
             if len(parts) >= 4:
@@ -18,18 +86,24 @@ def organize_files(data_dir):
                     date = datetime.strptime(date_str, '%Y%m%d')
                     date_dir = os.path.join(data_dir, sim_type, date_str)
 
-                    if not os.path.exists(date_dir):
-                        os.makedirs(date_dir)
-
                     src_path = os.path.join(data_dir, file_name)
                     dest_path = os.path.join(date_dir, file_name)
+                    pdf_path = os.path.join(date_dir, f"{os.path.splitext(file_name)[0]}.pdf")
+                    
+                    stat = os.stat(src_path)
+                    if incremental and is_organized(state.get(file_name), stat):
+                        skipped += 1
+                        continue
+
+                    if not os.path.exists(date_dir):
+                        os.makedirs(date_dir)
 
-                    # Copy file to the organized directory
-                    shutil.copy(src_path, dest_path)
-                    print(f'Copied {file_name} to {date_dir}')
+                    # Place the file in the organized directory
+                    action = transfer_file(src_path, dest_path, transfer)
+                    print(f'{action} {file_name} to {date_dir}')
                     
-                    # Generate PDF for the JSON file
-                    generate_pdf_from_json(src_path, os.path.join(date_dir, f"{os.path.splitext(file_name)[0]}.pdf"))
+                    # Queue a PDF for the JSON file
+                    reports.append((file_name, stat, dest_path, pdf_path))
                     
                 except ValueError as e:
                     print(f'Error parsing date for file {file_name}: {e}')
@@ -37,6 +111,22 @@ def organize_files(data_dir):
                 print(f'File name does not match expected pattern: {file_name}')
         else:
             print(f'Skipping non-JSON file: {file_name}')
+    
+    # Generate the PDF reports, in parallel when an executor is given
+    json_paths = [report[2] for report in reports]
+    pdf_paths = [report[3] for report in reports]
+    if executor is None:
+        results = [generate_pdf_from_json(j, p) for j, p in zip(json_paths, pdf_paths)]
+    else:
+        results = list(executor.map(generate_pdf_from_json, json_paths, pdf_paths))
+    
+    if incremental:
+        for (file_name, stat, dest_path, pdf_path), ok in zip(reports, results):
+            if ok and transfer != "move":
+                state[file_name] = {"size": stat.st_size, "mtime": stat.st_mtime,
+                                    "outputs": [dest_path, pdf_path]}
+        save_state(data_dir, state)
+        print(f'Organized {len(reports)} files in {data_dir}, skipped {skipped} unchanged')
 
 def generate_pdf_from_json(json_file_path, pdf_file_path):
     """Generate a PDF report from a JSON simulation file"""
@@ -96,11 +186,20 @@ def generate_pdf_from_json(json_file_path, pdf_file_path):
         # Save the PDF
         pdf.output(pdf_file_path)
         print(f"Generated PDF report: {pdf_file_path}")
+        return True
         
     except Exception as e:
         print(f"Error generating PDF from {json_file_path}: {e}")
+        return False
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Organize simulation JSON files by type and date and render PDF reports.')
+    parser.add_argument('--incremental', action='store_true', help='Skip files already organized by a previous run')
+    parser.add_argument('--transfer', choices=TRANSFER_MODES, default='copy',
+                        help='Place files by copy, hard link (falling back to copy) or move (default: copy)')
+    parser.add_argument('--workers', type=int, default=None, help='Processes rendering PDFs (default: CPU count)')
+    args = parser.parse_args()
+    
     directories = [
         'data/simulation_baseline',
         'data/simulation_adaptive_probabilistic',
@@ -108,12 +207,13 @@ if __name__ == "__main__":
         'data/simulation_full_features'
     ]
     
-    # Create directories if they don't exist
-    for directory in directories:
-        if not os.path.exists(directory):
-            os.makedirs(directory)
-        organize_files(directory)
-    
-    # Also organize the root data directory
-    organize_files('data')
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        # Create directories if they don't exist
+        for directory in directories:
+            if not os.path.exists(directory):
+                os.makedirs(directory)
+            organize_files(directory, args.incremental, args.transfer, executor)
+        
+        # Also organize the root data directory
+        organize_files('data', args.incremental, args.transfer, executor)
 
@@ -0,0 +1,143 @@
+"""
+Streaming anomaly detection for the universe simulation.
+Keeps an exponentially weighted mean and variance per metric and flags
+z-score outliers or CUSUM change-points as each new value arrives, using
+constant memory however long the simulation runs.
+"""
+
+import math
+
+# Metric name -> smallest standard deviation assumed when scoring it, so a
+# metric that has been flat for a while does not flag every small step
+DEFAULT_METRICS = {
+    "entropy": 0.01,
+    "cluster_count": 0.5,
+    "adaptive_count": 0.5,
+    "composite_count": 0.5,
+}
+
+# Anomaly type reported for a rise / fall of each metric
+ANOMALY_TYPES = {
+    "entropy": ("entropy_spike", "entropy_spike"),
+    "cluster_count": ("cluster_formation", "cluster_dissolution"),
+    "adaptive_count": ("adaptive_emergence", "adaptive_decline"),
+    "composite_count": ("phase_transition", "phase_transition"),
+}
+
+
+class RollingStats:
+    """Exponentially weighted mean and variance of a stream of values"""
+
+    def __init__(self, alpha=0.05):
+        self.alpha = alpha
+        self.count = 0
+        self.mean = 0.0
+        self.variance = 0.0
+
+    def update(self, value):
+        if self.count == 0:
+            self.mean = float(value)
+        else:
+            diff = value - self.mean
+            increment = self.alpha * diff
+            self.mean += increment
+            self.variance = (1 - self.alpha) * (self.variance + diff * increment)
+        self.count += 1
+
+    def zscore(self, value, min_std=0.0):
+        """Standardized distance of value from the current mean"""
+        return (value - self.mean) / max(math.sqrt(self.variance), min_std, 1e-12)
+
+
+class MetricDetector:
+    """
+    Online detector for one metric.
+
+    method="zscore" flags a value whose z-score against the rolling
+    statistics exceeds threshold. method="cusum" accumulates z-scores
+    beyond `drift` in both directions and flags a change-point when either
+    cumulative sum exceeds threshold, then restarts both sums. No value is
+    flagged until `warmup` values have been seen.
+    """
+
+    def __init__(self, method="zscore", alpha=0.05, threshold=4.0, drift=0.5,
+                 warmup=20, min_std=0.0):
+        if method not in ("zscore", "cusum"):
+            raise ValueError(f"Unknown anomaly detection method: {method}")
+        self.method = method
+        self.threshold = threshold
+        self.drift = drift
+        self.warmup = warmup
+        self.min_std = min_std
+        self.stats = RollingStats(alpha)
+        self.upper = 0.0
+        self.lower = 0.0
+
+    def update(self, value):
+        """
+        Feeds one value; returns (score, direction) when it is anomalous,
+        with direction +1 for a rise and -1 for a fall, else None
+        """
+        stats = self.stats
+        result = None
+        if stats.count >= self.warmup:
+            z = stats.zscore(value, self.min_std)
+            if self.method == "zscore":
+                if abs(z) > self.threshold:
+                    result = (abs(z), 1 if z > 0 else -1)
+            else:
+                self.upper = max(0.0, self.upper + z - self.drift)
+                self.lower = max(0.0, self.lower - z - self.drift)
+                if self.upper > self.threshold or self.lower > self.threshold:
+                    rising = self.upper >= self.lower
+                    result = (self.upper if rising else self.lower, 1 if rising else -1)
+                    self.upper = self.lower = 0.0
+        stats.update(value)
+        return result
+
+
+class StreamingAnomalyDetector:
+    """
+    Runs one MetricDetector per metric over a stream of state dicts and
+    reports anomalies in the detect_anomalies format.
+    """
+
+    def __init__(self, method="zscore", metrics=None, alpha=0.05, threshold=None,
+                 drift=0.5, warmup=20):
+        metrics = DEFAULT_METRICS if metrics is None else metrics
+        if threshold is None:
+            threshold = 4.0 if method == "zscore" else 8.0
+        self.threshold = threshold
+        self.detectors = {
+            name: MetricDetector(method, alpha, threshold, drift, warmup, min_std)
+            for name, min_std in metrics.items()
+        }
+        self.previous = {}
+
+    def update(self, state, timestamp, total_particles=0):
+        """Feeds one state dict of metric values and returns any new anomalies"""
+        anomalies = []
+        for name, detector in self.detectors.items():
+            value = state[name]
+            mean = detector.stats.mean
+            flagged = detector.update(value)
+            change = value - self.previous.get(name, value)
+            self.previous[name] = value
+            if flagged is None:
+                continue
+            score, direction = flagged
+            rise_type, fall_type = ANOMALY_TYPES.get(name, (f"{name}_rise", f"{name}_fall"))
+            if name == "entropy":
+                affected = total_particles
+            else:
+                affected = abs(round(change))
+            anomalies.append({
+                "timestamp": timestamp,
+                "type": rise_type if direction > 0 else fall_type,
+                "description": (f"{detector.method} change-point: {name} "
+                                f"{'rose' if direction > 0 else 'fell'} to {value:g} "
+                                f"(mean {mean:g})"),
+                "affected_particles": affected,
+                "severity": min(1, score / (2 * self.threshold))
+            })
+        return anomalies
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Columnar NPZ output for simulation results.
+Stores each time series metric as one NumPy column in
+simulation_<name>_<timestamp>.npz, with the config, anomalies and column
+list in a small simulation_<name>_<timestamp>.meta JSON sidecar, and
+converts existing simulation_*.json results to that format.
+"""
+
+import os
+import json
+import argparse
+import numpy as np
+
+SEPARATOR = "."  # Joins nested keys into column names, e.g. particle_counts.positive
+META_SUFFIX = ".meta"  # Not .json, so simulation_*.json globs only match results
+LEGACY_META_SUFFIX = ".meta.json"  # Sidecars written by earlier versions
+
+
+def flatten_point(point, prefix=""):
+    """Flattens a nested data point into {column name: value}"""
+    flat = {}
+    for key, value in point.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten_point(value, name + SEPARATOR))
+        else:
+            flat[name] = value
+    return flat
+
+
+def unflatten_point(flat):
+    """Inverse of flatten_point"""
+    point = {}
+    for name, value in flat.items():
+        *parents, key = name.split(SEPARATOR)
+        node = point
+        for parent in parents:
+            node = node.setdefault(parent, {})
+        node[key] = value
+    return point
+
+
+def time_series_columns(time_series_data):
+    """Converts a list of data points into {column name: array}"""
+    rows = [flatten_point(point) for point in time_series_data]
+    names = list(rows[0]) if rows else []
+    for row in rows[1:]:
+        names.extend(name for name in row if name not in names)
+    columns = {}
+    for name in names:
+        values = [row.get(name) for row in rows]
+        if any(value is None for value in values):
+            # Points that lack the metric read back as nan
+            columns[name] = np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+        else:
+            columns[name] = np.array(values)
+    return columns
+
+
+def result_paths(base):
+    """(npz path, sidecar path) for a result path without extension"""
+    return base + ".npz", base + META_SUFFIX
+
+
+def is_sidecar(file_name):
+    """Whether a file name is a columnar result sidecar, current or legacy"""
+    return file_name.endswith(META_SUFFIX) or file_name.endswith(LEGACY_META_SUFFIX)
+
+
+def save_columnar_result(base, config, time_series_data, anomalies, timestamp):
+    """Writes base.npz and its base.meta sidecar, replacing each file atomically"""
+    npz_path, meta_path = result_paths(base)
+    columns = time_series_columns(time_series_data)
+
+    temp_npz = npz_path + ".tmp"
+    with open(temp_npz, "wb") as f:
+        np.savez_compressed(f, **columns)
+    temp_meta = meta_path + ".tmp"
+    with open(temp_meta, "w") as f:
+        json.dump({
+            "config": config,
+            "anomalies": anomalies,
+            "timestamp": timestamp,
+            "columns": list(columns),
+            "samples": len(time_series_data)
+        }, f, indent=2)
+    os.replace(temp_npz, npz_path)
+    os.replace(temp_meta, meta_path)
+    return npz_path
+
+
+def load_metric(npz_path, column):
+    """One metric column of a columnar result, without reading the others"""
+    with np.load(npz_path) as columns:
+        return columns[column]
+
+
+def load_metrics(npz_paths, column):
+    """{path: column} for many results"""
+    return {path: load_metric(path, column) for path in npz_paths}
+
+
+def load_columnar_result(npz_path):
+    """Reads a columnar result back in the simulation_*.json layout"""
+    meta_path = result_paths(npz_path[:-len(".npz")])[1]
+    if not os.path.exists(meta_path):
+        meta_path = npz_path[:-len(".npz")] + LEGACY_META_SUFFIX
+    with open(meta_path, "r") as f:
+        meta = json.load(f)
+    with np.load(npz_path) as columns:
+        values = {name: columns[name].tolist() for name in meta["columns"]}
+    data = [unflatten_point({name: values[name][i] for name in meta["columns"]})
+            for i in range(meta["samples"])]
+    return {
+        "config": meta["config"],
+        "data": data,
+        "anomalies": meta["anomalies"],
+        "timestamp": meta["timestamp"]
+    }
+
+
+def convert_json_result(json_path, output_dir=None, remove=False):
+    """Converts one simulation_*.json result to the columnar format"""
+    with open(json_path, "r") as f:
+        result = json.load(f)
+    name = os.path.splitext(os.path.basename(json_path))[0]
+    base = os.path.join(output_dir or os.path.dirname(json_path), name)
+    npz_path = save_columnar_result(base, result.get("config", {}), result.get("data", []),
+                                    result.get("anomalies", []), result.get("timestamp"))
+    if remove:
+        os.remove(json_path)
+    return npz_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert simulation_*.json results to columnar NPZ files.')
+    parser.add_argument('paths', nargs='+', help='Result files or directories containing them')
+    parser.add_argument('--output_dir', default=None, help='Output directory (default: next to each input)')
+    parser.add_argument('--remove', action='store_true', help='Delete each JSON file after converting it')
+
+    args = parser.parse_args()
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+    json_paths = []
+    for path in args.paths:
+        if os.path.isdir(path):
+            json_paths.extend(os.path.join(path, name) for name in sorted(os.listdir(path))
+                              if name.startswith("simulation_") and name.endswith(".json")
+                              and not is_sidecar(name))
+        else:
+            json_paths.append(path)
+
+    for json_path in json_paths:
+        try:
+            npz_path = convert_json_result(json_path, args.output_dir, args.remove)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error converting {json_path}: {e}")
+            continue
+        print(f"Converted {json_path} -> {npz_path}")
+
+
+if __name__ == "__main__":
+    main()
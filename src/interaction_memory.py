@@ -0,0 +1,201 @@
+"""
+Sparse interaction memory for the universe simulation.
+Stores how strongly each particle remembers the others as a sorted
+(COO-style) table of directed edges keyed by integer particle ids, with
+lazy retention, weak-edge eviction and a cap on edges per particle.
+"""
+
+import numpy as np
+
+ID_BITS = 32
+ID_MASK = (1 << ID_BITS) - 1
+
+
+def pair_keys(a, b):
+    """Packs (a, b) id pairs into sortable int64 edge keys"""
+    return (np.asarray(a, dtype=np.int64) << ID_BITS) | (np.asarray(b, dtype=np.int64) & ID_MASK)
+
+
+class InteractionMemory:
+    """
+    Global sparse memory of particle interactions.
+
+    Each edge holds a strength and the step it was last written. Reading an
+    edge applies `retention` once per elapsed step, so a pair that
+    interacts every step sees exactly old * retention + amount. Edges that
+    decay below `min_strength` are evicted when a step ends, and each
+    particle holds at most `max_per_particle` edges: once a particle is
+    full, new partners are only recorded after older edges decay out.
+
+    Reinforcements and merges are queued and applied in one batch when the
+    step ends (tick) or before any read, so each pair should be reinforced
+    at most once per step. Merges are applied after the step's
+    reinforcements, in the order they were queued.
+    """
+
+    def __init__(self, retention=0.95, min_strength=1e-3, max_per_particle=64):
+        self.retention = retention
+        self.min_strength = min_strength
+        self.max_per_particle = max_per_particle
+        self.step = 0
+        self.keys = np.empty(0, dtype=np.int64)
+        self.strength = np.empty(0, dtype=np.float32)
+        self.last_step = np.empty(0, dtype=np.int64)
+        self._pending_pairs = []
+        self._pending_batches = []
+        self._pending_merges = []
+
+    def __len__(self):
+        self.flush()
+        return len(self.keys)
+
+    def _decayed(self, index):
+        """Strength of the edges at `index` as of the current step"""
+        elapsed = self.step - self.last_step[index]
+        return self.strength[index] * np.power(self.retention, elapsed, dtype=np.float32)
+
+    def reinforce(self, a, b, amount):
+        """Queues a symmetric reinforcement of the pair (a, b)"""
+        self._pending_pairs.append((a, b, amount))
+
+    def reinforce_pairs(self, a, b, amount):
+        """Queues symmetric reinforcements for arrays of pairs"""
+        a = np.asarray(a, dtype=np.int64)
+        b = np.asarray(b, dtype=np.int64)
+        self._pending_batches.append((a, b, np.full(len(a), amount, dtype=np.float32)))
+
+    def flush(self):
+        """Applies all queued reinforcements and merges at the current step"""
+        if self._pending_pairs or self._pending_batches:
+            self._apply_reinforcements()
+        if self._pending_merges:
+            self._apply_merges()
+
+    def _apply_reinforcements(self):
+        batches = self._pending_batches
+        if self._pending_pairs:
+            a, b, amount = zip(*self._pending_pairs)
+            batches.append((np.array(a, dtype=np.int64), np.array(b, dtype=np.int64),
+                            np.array(amount, dtype=np.float32)))
+        self._pending_pairs = []
+        self._pending_batches = []
+
+        a = np.concatenate([batch[0] for batch in batches])
+        b = np.concatenate([batch[1] for batch in batches])
+        amounts = np.concatenate([batch[2] for batch in batches])
+        new_keys, inverse = np.unique(np.concatenate([pair_keys(a, b), pair_keys(b, a)]),
+                                      return_inverse=True)
+        amounts = np.bincount(inverse, weights=np.tile(amounts, 2)).astype(np.float32)
+        self._add(new_keys, amounts)
+
+    def _add(self, keys, amounts):
+        """Adds amounts to the sorted, unique edge keys, creating missing edges"""
+        # Existing edges: old strength decayed to this step, plus amount
+        index = np.searchsorted(self.keys, keys)
+        found = index < len(self.keys)
+        found[found] = self.keys[index[found]] == keys[found]
+        hit = index[found]
+        self.strength[hit] = self._decayed(hit) + amounts[found]
+        self.last_step[hit] = self.step
+
+        # New edges start at the amount, if their particle has free slots
+        self._insert(keys[~found], amounts[~found])
+
+    def _insert(self, keys, strength):
+        """Inserts sorted new edge keys into the free slots of each particle"""
+        if len(keys) == 0:
+            return
+        rows = keys >> ID_BITS
+        starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+        counts = np.diff(np.r_[starts, len(rows)])
+        used = (np.searchsorted(self.keys, (rows[starts] + 1) << ID_BITS) -
+                np.searchsorted(self.keys, rows[starts] << ID_BITS))
+        rank = np.arange(len(rows)) - np.repeat(starts, counts)
+        fits = rank < np.repeat(self.max_per_particle - used, counts)
+        keys, strength = keys[fits], strength[fits]
+
+        positions = np.searchsorted(self.keys, keys)
+        self.keys = np.insert(self.keys, positions, keys)
+        self.strength = np.insert(self.strength, positions, strength)
+        self.last_step = np.insert(self.last_step, positions, self.step)
+
+    def _keep(self, mask):
+        self.keys = self.keys[mask]
+        self.strength = self.strength[mask]
+        self.last_step = self.last_step[mask]
+
+    def tick(self):
+        """Ends the current step: applies queued updates and evicts weak edges"""
+        self.flush()
+        self.step += 1
+        if len(self.keys):
+            self._keep(self._decayed(np.arange(len(self.keys))) >= self.min_strength)
+
+    def _row_slice(self, particle_id):
+        lo = np.searchsorted(self.keys, particle_id << ID_BITS)
+        hi = np.searchsorted(self.keys, (particle_id + 1) << ID_BITS)
+        return slice(lo, hi)
+
+    def strength_of(self, a, b):
+        """How strongly particle a remembers particle b"""
+        self.flush()
+        key = int(pair_keys(a, b))
+        index = np.searchsorted(self.keys, key)
+        if index < len(self.keys) and self.keys[index] == key:
+            return float(self._decayed(index))
+        return 0.0
+
+    def row(self, particle_id):
+        """A particle's memory in the {str(other_id): strength} format"""
+        self.flush()
+        rows = self._row_slice(int(particle_id))
+        others = self.keys[rows] & ID_MASK
+        strength = self._decayed(np.arange(rows.start, rows.stop))
+        return {str(int(other)): float(s) for other, s in zip(others, strength)}
+
+    def load_row(self, particle_id, memory):
+        """Loads a {str(other_id): strength} dict as edges written this step"""
+        self.flush()
+        self._keep(self.keys >> ID_BITS != particle_id)
+        others = np.array([int(pid) for pid in memory], dtype=np.int64)
+        strength = np.array(list(memory.values()), dtype=np.float32)
+        order = np.argsort(others)
+        self._insert(pair_keys(np.full(len(others), particle_id), others[order]), strength[order])
+
+    def merge(self, winner, absorbed, factor=0.5):
+        """Queues adding `factor` times the absorbed particle's memory row to the winner's"""
+        self._pending_merges.append((int(winner), int(absorbed), factor))
+
+    def _apply_merges(self):
+        merges = self._pending_merges
+        self._pending_merges = []
+        start = 0
+        while start < len(merges):
+            # Merges that read no row written earlier in the wave are applied together
+            written = set()
+            end = start
+            while end < len(merges) and merges[end][1] not in written:
+                written.add(merges[end][0])
+                end += 1
+            self._merge_rows(merges[start:end])
+            start = end
+
+    def _merge_rows(self, merges):
+        winner, absorbed, factor = (np.array(column) for column in zip(*merges))
+        lo = np.searchsorted(self.keys, absorbed.astype(np.int64) << ID_BITS)
+        hi = np.searchsorted(self.keys, (absorbed.astype(np.int64) + 1) << ID_BITS)
+        counts = hi - lo
+        index = np.repeat(lo - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        winners = np.repeat(winner, counts)
+        others = self.keys[index] & ID_MASK
+        added = self._decayed(index) * np.repeat(factor, counts).astype(np.float32)
+        not_self = others != winners
+        keys, inverse = np.unique(pair_keys(winners[not_self], others[not_self]), return_inverse=True)
+        self._add(keys, np.bincount(inverse, weights=added[not_self], minlength=len(keys)).astype(np.float32))
+
+    def forget(self, particle_ids):
+        """Drops every edge from or to the given particles"""
+        self.flush()
+        ids = np.asarray(list(particle_ids), dtype=np.int64)
+        if len(ids) and len(self.keys):
+            self._keep(~(np.isin(self.keys >> ID_BITS, ids) | np.isin(self.keys & ID_MASK, ids)))
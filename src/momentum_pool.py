@@ -0,0 +1,102 @@
+"""
+Momentum pools sampled from ATLAS ROOT files.
+Streams only the px/py/pz branches of a tree through uproot.iterate in
+bounded chunks, reservoir-samples a fixed number of rows into one
+contiguous float32 array and caches it as a .npy file next to the source,
+so later startups load a small array instead of reading the whole tree.
+"""
+
+import os
+import numpy as np
+
+MOMENTUM_BRANCHES = ("px", "py", "pz")
+DEFAULT_POOL_SIZE = 100_000
+DEFAULT_STEP_SIZE = "100 MB"  # Upper bound on the memory of one chunk
+
+
+def pool_cache_path(root_path, size):
+    return f"{root_path}.momentum_pool_{size}.npy"
+
+
+def _flat_column(values):
+    # Jagged branches (one value per particle in each event) come back as object arrays
+    if values.dtype == object:
+        values = np.concatenate(values) if len(values) else np.empty(0)
+    return np.asarray(values, dtype=np.float32)
+
+
+def read_momentum_chunks(root_path, tree_name="Events", step_size=DEFAULT_STEP_SIZE):
+    """Yields (n, 3) float32 arrays of px, py, pz rows from a ROOT tree"""
+    import uproot  # Only needed when a pool is not cached yet
+    for chunk in uproot.iterate(f"{root_path}:{tree_name}", list(MOMENTUM_BRANCHES),
+                                step_size=step_size, library="np"):
+        yield np.column_stack([_flat_column(chunk[name]) for name in MOMENTUM_BRANCHES])
+
+
+def reservoir_sample(chunks, size, rng=None):
+    """
+    Uniform sample of at most `size` rows from a stream of row chunks
+    (Algorithm R applied a chunk at a time), in O(size) memory
+    """
+    rng = rng if rng is not None else np.random.default_rng(0)
+    pool = None
+    seen = 0
+    for rows in chunks:
+        if pool is None:
+            pool = np.empty((size,) + rows.shape[1:], dtype=np.float32)
+        # Rows that still fit fill the reservoir directly
+        fill = min(len(rows), max(0, size - seen))
+        pool[seen:seen + fill] = rows[:fill]
+        seen += fill
+        rows = rows[fill:]
+        if len(rows) == 0:
+            continue
+        # Row number t (0-based) replaces a random slot with probability size / (t + 1)
+        slots = rng.integers(0, seen + np.arange(1, len(rows) + 1))
+        keep = slots < size
+        pool[slots[keep]] = rows[keep]  # Later rows win repeated slots, as in the sequential algorithm
+        seen += len(rows)
+    if pool is None:
+        return np.empty((0, 3), dtype=np.float32)
+    return pool[:min(seen, size)]
+
+
+def load_momentum_pool(root_path, tree_name="Events", size=DEFAULT_POOL_SIZE,
+                       step_size=DEFAULT_STEP_SIZE, use_cache=True):
+    """
+    (n, 3) float32 momentum pool for a ROOT file, from its cache when the
+    cache is newer than the file. A cached pool is used on its own when the
+    ROOT file is absent.
+    """
+    cache_path = pool_cache_path(root_path, size)
+    root_exists = os.path.exists(root_path)
+    if use_cache and os.path.exists(cache_path):
+        if not root_exists or os.path.getmtime(cache_path) >= os.path.getmtime(root_path):
+            return np.load(cache_path)
+    if not root_exists:
+        raise FileNotFoundError(root_path)
+
+    pool = np.ascontiguousarray(reservoir_sample(read_momentum_chunks(root_path, tree_name, step_size), size))
+    if use_cache:
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "wb") as f:
+                np.save(f, pool)
+            os.replace(temp_path, cache_path)
+        except OSError as e:
+            print(f"Could not cache momentum pool at {cache_path}: {e}")
+    return pool
+
+
+class MomentumPool:
+    """Momentum rows that random draws pick from in O(1)"""
+
+    def __init__(self, momenta):
+        self.momenta = np.ascontiguousarray(momenta, dtype=np.float32)
+
+    def __len__(self):
+        return len(self.momenta)
+
+    def draw(self, rng):
+        """Momentum [px, py, pz] of a uniformly random row, drawn with a random.Random"""
+        return self.momenta[rng.randint(0, len(self.momenta) - 1)].tolist()
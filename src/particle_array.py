@@ -0,0 +1,172 @@
+"""
+Structure-of-arrays particle store for the universe simulation.
+Holds every particle property as a typed NumPy column so updates can be
+applied to the whole population at once instead of per-particle dicts.
+"""
+
+import numpy as np
+
+from interaction_memory import InteractionMemory
+
+# Small-int codes for the categorical properties
+CHARGES = ("positive", "negative", "neutral")
+TYPES = ("standard", "high-energy", "quantum", "composite", "adaptive")
+CHARGE_CODES = {name: code for code, name in enumerate(CHARGES)}
+TYPE_CODES = {name: code for code, name in enumerate(TYPES)}
+
+POSITIVE, NEGATIVE, NEUTRAL = range(len(CHARGES))
+STANDARD, HIGH_ENERGY, QUANTUM, COMPOSITE, ADAPTIVE = range(len(TYPES))
+
+# Column name -> dtype for every numeric property of a particle
+COLUMNS = {
+    "id": np.int64,
+    "charge": np.int8,
+    "type": np.int8,
+    "knowledge": np.float64,
+    "complexity": np.float64,
+    "energy": np.float64,
+    "stability": np.float64,
+    "interactions": np.int64,
+    "phase": np.float64,
+    "entropy": np.float64,
+    "adaptive_score": np.float64,
+    "cluster_id": np.int64,
+    "age": np.int64,
+    "energy_capacity": np.float64,
+    "decay_rate": np.float64,
+}
+
+# Order of keys in the exported dicts (matches create_particle_from_field)
+DICT_KEYS = (
+    "id", "charge", "type", "knowledge", "complexity", "energy", "stability",
+    "interactions", "phase", "entropy", "adaptive_score", "cluster_id", "age",
+    "energy_capacity", "decay_rate", "interaction_memory"
+)
+
+
+class ParticleView:
+    """Dict-like view of a single row of a ParticleArray"""
+
+    __slots__ = ("_array", "_index")
+
+    def __init__(self, array, index):
+        self._array = array
+        self._index = index
+
+    def __getitem__(self, key):
+        return self._array.get_value(self._index, key)
+
+    def __setitem__(self, key, value):
+        self._array.set_value(self._index, key, value)
+
+    def get(self, key, default=None):
+        if key in COLUMNS or key == "interaction_memory":
+            return self[key]
+        return default
+
+    def keys(self):
+        return DICT_KEYS
+
+    def to_dict(self):
+        """Export the particle in the same shape as create_particle_from_field"""
+        return {key: self[key] for key in DICT_KEYS}
+
+
+class ParticleArray:
+    """Columnar particle storage with small-int charge and type codes"""
+
+    def __init__(self, capacity=128, memory=None):
+        self.capacity = max(1, capacity)
+        self.size = 0
+        for name, dtype in COLUMNS.items():
+            setattr(self, name, np.zeros(self.capacity, dtype=dtype))
+        # Sparse pairwise interaction memory, keyed by particle id
+        self.memory = memory if memory is not None else InteractionMemory()
+
+    @classmethod
+    def from_dicts(cls, particles):
+        """Build an array from a list of particle dicts"""
+        array = cls(capacity=max(1, len(particles)))
+        for p in particles:
+            array.append(p)
+            if p.get("interaction_memory"):
+                array.memory.load_row(p["id"], p["interaction_memory"])
+        return array
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("particle index out of range")
+        return ParticleView(self, index)
+
+    def __iter__(self):
+        for index in range(self.size):
+            yield ParticleView(self, index)
+
+    def _grow(self, min_capacity):
+        """Double the column capacity until it fits min_capacity rows"""
+        new_capacity = self.capacity
+        while new_capacity < min_capacity:
+            new_capacity *= 2
+        for name in COLUMNS:
+            column = getattr(self, name)
+            grown = np.zeros(new_capacity, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            setattr(self, name, grown)
+        self.capacity = new_capacity
+
+    def append(self, particle):
+        """Append a particle dict (as built by create_particle_from_field)"""
+        if self.size >= self.capacity:
+            self._grow(self.size + 1)
+        row = self.size
+        self.size += 1
+        for name in COLUMNS:
+            self.set_value(row, name, particle.get(name, 0))
+        return row
+
+    def remove(self, indices):
+        """Remove the rows in indices and compact the remaining particles"""
+        keep = np.ones(self.size, dtype=bool)
+        keep[np.asarray(list(indices), dtype=np.int64)] = False
+        self.memory.forget(self.id[:self.size][~keep])
+        kept = np.flatnonzero(keep)
+        new_size = len(kept)
+        for name in COLUMNS:
+            column = getattr(self, name)
+            column[:new_size] = column[kept]
+        self.size = new_size
+
+    def get_value(self, index, key):
+        if key == "charge":
+            return CHARGES[self.charge[index]]
+        if key == "type":
+            return TYPES[self.type[index]]
+        if key == "interaction_memory":
+            return self.memory.row(self.id[index])
+        return getattr(self, key)[index].item()
+
+    def set_value(self, index, key, value):
+        if key == "charge":
+            value = CHARGE_CODES[value]
+        elif key == "type":
+            value = TYPE_CODES[value]
+        elif key == "interaction_memory":
+            raise KeyError("interaction_memory is stored in ParticleArray.memory")
+        getattr(self, key)[index] = value
+
+    def charge_counts(self):
+        """Number of particles per charge code"""
+        return np.bincount(self.charge[:self.size], minlength=len(CHARGES))
+
+    def type_counts(self):
+        """Number of particles per type code"""
+        return np.bincount(self.type[:self.size], minlength=len(TYPES))
+
+    def to_dicts(self):
+        """Export every particle as today's dict format for the JSON output"""
+        return [ParticleView(self, index).to_dict() for index in range(self.size)]
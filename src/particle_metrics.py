@@ -0,0 +1,164 @@
+"""
+Streaming particle metrics for the universe simulation.
+Keeps the charge/type histogram, knowledge and complexity sums, maximum
+complexity and cluster sums up to date as particles are created, updated
+and removed, so taking a data point snapshot no longer rescans particles.
+"""
+
+import heapq
+
+from cluster_index import ClusterIndex, KNOWLEDGE, AGE
+
+# particle_counts key for each charge and type, in data point order
+COUNT_KEYS = ("positive", "negative", "neutral", "high_energy", "quantum",
+              "standard", "composite", "adaptive")
+CHARGE_KEYS = {"positive": "positive", "negative": "negative", "neutral": "neutral"}
+TYPE_KEYS = {"high-energy": "high_energy", "quantum": "quantum", "standard": "standard",
+             "composite": "composite", "adaptive": "adaptive"}
+
+SUMMED = ("knowledge", "complexity")
+
+# A running sum that falls below this fraction of its peak has lost too much
+# precision to cancellation and is recomputed at the next snapshot
+PRECISION_LOSS = 1e-6
+
+
+class ParticleMetrics:
+    """
+    Running statistics of a list of particle dicts.
+
+    Callers report every change the same way as to a ClusterIndex: add and
+    discard for particles entering or leaving the system, interacted for a
+    plain knowledge exchange, replace when a particle dict is swapped for
+    an otherwise updated copy, and age when a particle ages in place.
+
+    Knowledge can overflow to inf and huge values can later leave the
+    system, so a sum that turns nan or cancels down to a tiny fraction of
+    its peak is marked dirty and resummed exactly from the particles at the
+    next snapshot.
+    """
+
+    def __init__(self, particles=()):
+        self.total = 0
+        self.counts = dict.fromkeys(COUNT_KEYS, 0)
+        self.sums = dict.fromkeys(SUMMED, 0.0)
+        self.peaks = dict.fromkeys(SUMMED, 0.0)
+        self.dirty = False
+        # Max-heap (negated) of complexities with lazy deletion
+        self.complexity_heap = []
+        self.complexity_counts = {}
+        self.clusters = ClusterIndex()
+        for p in particles:
+            self.add(p)
+
+    def __len__(self):
+        return self.total
+
+    def _shift(self, key, removed, added):
+        # interacted only ever grows the sums, so peaks catch up here
+        peak = max(self.peaks[key], abs(self.sums[key]))
+        total = self.sums[key] - removed + added
+        if total != total or abs(total) < peak * PRECISION_LOSS:
+            self.dirty = True
+        self.peaks[key] = max(peak, abs(total))
+        self.sums[key] = total
+
+    def _count(self, p, amount):
+        self.counts[CHARGE_KEYS[p["charge"]]] += amount
+        self.counts[TYPE_KEYS[p["type"]]] += amount
+
+    def _add_complexity(self, complexity):
+        count = self.complexity_counts.get(complexity, 0)
+        self.complexity_counts[complexity] = count + 1
+        if count == 0:
+            heapq.heappush(self.complexity_heap, -complexity)
+
+    def _discard_complexity(self, complexity):
+        count = self.complexity_counts[complexity] - 1
+        if count:
+            self.complexity_counts[complexity] = count
+            return
+        del self.complexity_counts[complexity]
+        # Rebuild once stale entries dominate the heap
+        if len(self.complexity_heap) > 4 * len(self.complexity_counts) + 64:
+            self.complexity_heap = [-c for c in self.complexity_counts]
+            heapq.heapify(self.complexity_heap)
+
+    def add(self, p):
+        self.total += 1
+        self._count(p, 1)
+        for key in SUMMED:
+            self._shift(key, 0.0, p[key])
+        self._add_complexity(p["complexity"])
+        self.clusters.add(p)
+
+    def discard(self, p):
+        self.total -= 1
+        self._count(p, -1)
+        for key in SUMMED:
+            self._shift(key, p[key], 0.0)
+        self._discard_complexity(p["complexity"])
+        self.clusters.discard(p)
+
+    def replace(self, old, new):
+        """Swaps a particle's old state for its updated copy"""
+        if old["charge"] != new["charge"] or old["type"] != new["type"]:
+            self._count(old, -1)
+            self._count(new, 1)
+        for key in SUMMED:
+            if old[key] != new[key]:
+                self._shift(key, old[key], new[key])
+        if old["complexity"] != new["complexity"]:
+            self._discard_complexity(old["complexity"])
+            self._add_complexity(new["complexity"])
+        self.clusters.replace(old, new)
+
+    def interacted(self, p1, p2, knowledge_gain):
+        """Records an interaction that added knowledge_gain to both particles"""
+        self.sums["knowledge"] += 2 * knowledge_gain
+        # Inlined ClusterIndex.interacted: this runs once per interaction
+        cid1, cid2 = p1["cluster_id"], p2["cluster_id"]
+        if cid1 != -1 or cid2 != -1:
+            clusters = self.clusters.clusters
+            if cid1 != -1:
+                record = clusters[cid1]
+                record[KNOWLEDGE] += knowledge_gain
+                record[AGE] += 1
+            if cid2 != -1:
+                record = clusters[cid2]
+                record[KNOWLEDGE] += knowledge_gain
+                record[AGE] += 1
+
+    def age(self, p, amount=1):
+        """Records that p aged by amount in place"""
+        self.clusters.age(p, amount)
+
+    def max_complexity(self):
+        heap = self.complexity_heap
+        while heap and -heap[0] not in self.complexity_counts:
+            heapq.heappop(heap)
+        return -heap[0] if heap else 1
+
+    def resync(self, particles):
+        """Recomputes the sums exactly from the particles"""
+        for key in SUMMED:
+            total = sum(p[key] for p in particles)
+            self.sums[key] = total
+            self.peaks[key] = abs(total)
+        self.dirty = False
+
+    def snapshot(self, particles):
+        """
+        Data point metrics in run_simulation's format; `particles` is only
+        read when a sum needs to be recomputed
+        """
+        if self.dirty:
+            self.resync(particles)
+        return {
+            "particle_counts": dict(self.counts),
+            "total_particles": self.total,
+            "avg_knowledge": self.sums["knowledge"] / max(1, self.total),
+            "avg_complexity": self.sums["complexity"] / max(1, self.total),
+            "max_complexity": self.max_complexity(),
+            "cluster_analysis": self.clusters.analyze()
+        }
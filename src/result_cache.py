@@ -0,0 +1,103 @@
+"""
+Content-addressed cache for simulation results.
+Stores the time series and anomalies of each finished run under a hash of
+its parameters, seed and engine version, and evicts the least recently
+used entries once the cache grows past its entry or size limit.
+"""
+
+import os
+import json
+import hashlib
+
+CACHE_DIR = os.path.join("data", "cache")
+
+
+def cache_key(params, iterations, engine_version):
+    """Hash of everything that determines a seeded simulation's output"""
+    payload = json.dumps({
+        "params": params,
+        "iterations": iterations,
+        "engine_version": engine_version
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    Directory of <key>.json result files with LRU eviction.
+
+    A file's mtime records when it was last read or written, so eviction
+    removes the oldest files first until both max_entries and max_bytes
+    hold. Entries are written to a temporary file and renamed into place,
+    so concurrent writers of the same key never leave a partial file.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, max_entries=64, max_bytes=256 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key):
+        """Returns (time_series_data, anomalies) for key, or None on a miss"""
+        path = self._path(key)
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        try:
+            os.utime(path)  # Mark as recently used
+        except FileNotFoundError:
+            pass  # Evicted by another process since we read it
+        return entry["time_series_data"], entry["anomalies"]
+
+    def put(self, key, time_series_data, anomalies):
+        """Stores a result under key and evicts old entries if over the limits"""
+        path = self._path(key)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump({"time_series_data": time_series_data, "anomalies": anomalies}, f)
+        os.replace(temp_path, path)
+        self.evict()
+
+    def entries(self):
+        """(mtime, size, path) of every cached result, oldest first"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        return entries
+
+    def evict(self):
+        """Removes least recently used entries until the cache fits its limits"""
+        entries = self.entries()
+        total_bytes = sum(size for _, size, _ in entries)
+        count = len(entries)
+        for _, size, path in entries:
+            if count <= self.max_entries and total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            count -= 1
+            total_bytes -= size
+
+    def clear(self):
+        """Removes every cached result"""
+        for _, _, path in self.entries():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
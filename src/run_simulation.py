@@ -4,70 +4,137 @@ Enhanced Universe Simulation Data Collection Script
 This script runs advanced simulations of the universe model and saves comprehensive data.
 """
 
+startup_timer = None
+if __name__ == "__main__":
+    from startup_profile import profile_startup
+    startup_timer = profile_startup()  # Times the imports below when run with --profile-startup
+
 import os
 import json
 import random
 import math
 import time
+import argparse
 import numpy as np
 from datetime import datetime
 
+from anomaly_detector import StreamingAnomalyDetector
+from cluster_index import ClusterIndex
+from columnar_output import save_columnar_result
+from interaction_memory import InteractionMemory
+from particle_metrics import ParticleMetrics
+from result_cache import ResultCache, cache_key
+from summary_log import record_run
+from particle_array import ParticleArray, CHARGE_CODES, TYPE_CODES
+from vectorized_engine import interact_all_pairs, array_particle_counts, analyze_array_clusters
+
 # Ensure data directory exists
 DATA_DIR = "data"
 if not os.path.exists(DATA_DIR):
     os.makedirs(DATA_DIR)
 
-def simulate_intent_field(size=10, fluctuation_rate=0.01, probabilistic=True):
-    """Simulates an intent field with probabilistic fluctuations"""
-    field = [[[random.random() * 2 - 1 for _ in range(size)] 
-              for _ in range(size)] 
-             for _ in range(size)]
+# Bump whenever a change alters simulation output, so cached results are not reused
+ENGINE_VERSION = 6
+
+# Default random stream for intent field generation
+_field_rng = np.random.default_rng()
+
+# Simulation subsystems that each get an independent random stream
+RANDOM_STREAMS = ("field", "particles", "interactions", "engine", "placement")
+
+def make_random_streams(seed=None):
+    """
+    Spawns one independent random stream per simulation subsystem from seed
+    
+    Array work (the intent field and the vectorized engine) gets numpy
+    Generators. The per-particle scalar paths get random.Random instances
+    seeded from their own SeedSequence child, because scalar draws from a
+    numpy Generator are roughly ten times slower.
+    """
+    children = np.random.SeedSequence(seed).spawn(len(RANDOM_STREAMS))
+    streams = {}
+    for name, child in zip(RANDOM_STREAMS, children):
+        if name in ("field", "engine"):
+            streams[name] = np.random.default_rng(child)
+        else:
+            streams[name] = random.Random(int(child.generate_state(1, np.uint64)[0]))
+    return streams
+
+def _scalar_rng(rng):
+    """Accepts a random.Random, an int seed or None (the global random module)"""
+    if rng is None:
+        return random
+    if isinstance(rng, int):
+        return random.Random(rng)
+    return rng
+
+# Scratch buffers reused across field updates, keyed by field shape
+_field_scratch = {}
+
+def simulate_intent_field(size=10, fluctuation_rate=0.01, probabilistic=True, out=None, rng=None):
+    """
+    Simulates an intent field with probabilistic fluctuations
+    
+    The field is a (size, size, size) float32 array indexed as [z, y, x].
+    Pass a previously returned field as `out` to regenerate it in place.
+    rng is a numpy Generator or an int seed.
+    """
+    if rng is None:
+        rng = _field_rng
+    elif isinstance(rng, int):
+        rng = np.random.default_rng(rng)
+    shape = (size, size, size)
+    if out is None:
+        out = np.empty(shape, dtype=np.float32)
+    elif out.shape != shape or out.dtype != np.float32:
+        raise ValueError(f"out must be a float32 array of shape {shape}")
+    field = out
+    scratch = _field_scratch.get(shape)
+    if scratch is None:
+        scratch = _field_scratch[shape] = np.empty(shape, dtype=np.float32)
+    
+    # Base field uniformly distributed in [-1, 1)
+    rng.random(dtype=np.float32, out=field)
+    field *= 2
+    field -= 1
     
     # Apply fluctuations
-    for z in range(size):
-        for y in range(size):
-            for x in range(size):
-                # Probabilistic fluctuation - not every cell changes
-                if random.random() < 0.3:  # Only 30% of cells change
-                    if probabilistic:
-                        # Use gaussian-like distribution
-                        u1, u2 = random.random(), random.random()
-                        rand_std_normal = math.sqrt(-2.0 * math.log(u1)) * math.sin(2.0 * math.pi * u2)
-                        fluctuation = rand_std_normal * fluctuation_rate * 0.3
-                    else:
-                        # Standard uniform random fluctuation
-                        fluctuation = (random.random() * 2 - 1) * fluctuation_rate
-                    
-                    field[z][y][x] += fluctuation
-                    field[z][y][x] = max(-1, min(1, field[z][y][x]))
+    if probabilistic:
+        # Use gaussian distribution
+        rng.standard_normal(dtype=np.float32, out=scratch)
+        scratch *= fluctuation_rate * 0.3
+    else:
+        # Standard uniform random fluctuation
+        rng.random(dtype=np.float32, out=scratch)
+        scratch *= 2
+        scratch -= 1
+        scratch *= fluctuation_rate
+    
+    # Probabilistic fluctuation - only 30% of cells change
+    scratch *= rng.random(shape, dtype=np.float32) < 0.3
+    field += scratch
+    np.clip(field, -1, 1, out=field)
     
     # Occasionally create wave-like patterns
-    if random.random() < 0.05:  # 5% chance
-        wave_origin = (
-            random.randint(0, size-1),
-            random.randint(0, size-1),
-            random.randint(0, size-1)
-        )
-        wave_strength = random.random() * 0.5 * fluctuation_rate
-        wavelength = random.random() * 5 + 5  # 5-10 cells
+    if rng.random() < 0.05:  # 5% chance
+        wave_origin = rng.integers(0, size, 3)
+        wave_strength = rng.random() * 0.5 * fluctuation_rate
+        wavelength = rng.random() * 5 + 5  # 5-10 cells
         
-        for z in range(size):
-            for y in range(size):
-                for x in range(size):
-                    distance = math.sqrt(
-                        (x - wave_origin[0])**2 + 
-                        (y - wave_origin[1])**2 + 
-                        (z - wave_origin[2])**2
-                    )
-                    wave_effect = (math.sin(distance / wavelength * math.pi * 2) * 
-                                wave_strength * math.exp(-distance / (wavelength * 2)))
-                    field[z][y][x] += wave_effect
-                    field[z][y][x] = max(-1, min(1, field[z][y][x]))
+        z, y, x = np.ogrid[:size, :size, :size]
+        np.sqrt(((x - wave_origin[0])**2 +
+                 (y - wave_origin[1])**2 +
+                 (z - wave_origin[2])**2).astype(np.float32), out=scratch)
+        wave_effect = (np.sin(scratch / wavelength * math.pi * 2) *
+                       wave_strength * np.exp(-scratch / (wavelength * 2)))
+        field += wave_effect
+        np.clip(field, -1, 1, out=field)
     
     return field
 
-def create_particle_from_field(field_value, id, enable_adaptive=False):
+def create_particle_from_field(field_value, id, enable_adaptive=False, rng=None):
     """Creates an enhanced particle based on field value"""
+    rng = _scalar_rng(rng)
     charge = "positive" if field_value > 0.3 else "negative" if field_value < -0.3 else "neutral"
     
     # Determine particle type based on field value
@@ -80,23 +147,23 @@ def create_particle_from_field(field_value, id, enable_adaptive=False):
         particle_type = "standard"
     
     # Create adaptive particles if enabled
-    if enable_adaptive and random.random() < 0.1:  # 10% chance
+    if enable_adaptive and rng.random() < 0.1:  # 10% chance
         particle_type = "adaptive"
     
     # Basic properties
-    knowledge = random.random() * 0.3  # Initial knowledge
+    knowledge = rng.random() * 0.3  # Initial knowledge
     energy = abs(field_value) * 2
     complexity = 1.0
-    stability = random.random() * 0.8 + 0.2
+    stability = rng.random() * 0.8 + 0.2
     
     # Enhanced properties
-    phase = random.random() * math.pi * 2  # Quantum phase
-    entropy = random.random()  # Initial entropy
+    phase = rng.random() * math.pi * 2  # Quantum phase
+    entropy = rng.random()  # Initial entropy
     adaptive_score = 1.0 if particle_type == "adaptive" else 0.0
     cluster_id = -1  # Not in a cluster
     age = 0
-    energy_capacity = 1.0 + random.random() * 0.5
-    decay_rate = 0.0001 + random.random() * 0.0001
+    energy_capacity = 1.0 + rng.random() * 0.5
+    decay_rate = 0.0001 + rng.random() * 0.0001
     interaction_memory = {}  # Empty memory
     
     return {
@@ -119,8 +186,19 @@ def create_particle_from_field(field_value, id, enable_adaptive=False):
         "interaction_memory": interaction_memory
     }
 
-def simulate_interaction(particle1, particle2, learning_rate=0.1):
-    """Simulates enhanced interaction between two particles"""
+def simulate_interaction(particle1, particle2, learning_rate=0.1, memory=None, rng=None, tracker=None):
+    """
+    Simulates enhanced interaction between two particles
+    
+    When an InteractionMemory is passed as `memory`, pair memories are kept
+    in that shared sparse store instead of each particle's
+    interaction_memory dict. rng is a random.Random or an int seed.
+    When a ClusterIndex or ParticleMetrics is passed as `tracker`, it is
+    told about the interaction: as a plain knowledge exchange in the common
+    case, or as a full replacement of both particles after a cluster or
+    composite event.
+    """
+    rng = _scalar_rng(rng)
     # Copy particles to avoid modifying originals
     p1 = particle1.copy()
     p2 = particle2.copy()
@@ -144,20 +222,24 @@ def simulate_interaction(particle1, particle2, learning_rate=0.1):
         interaction_chance = 0.3 + phase_factor * 0.5
     
     # Check if interaction occurs
-    if random.random() > interaction_chance:
+    if rng.random() > interaction_chance:
         return p1, p2, False
     
     # Update interaction memory
     p1_id, p2_id = p1["id"], p2["id"]
     memory_retention = 0.95  # How much old memories persist
     
-    # P1's memory of P2
-    old_memory_p1 = p1["interaction_memory"].get(str(p2_id), 0)
-    p1["interaction_memory"][str(p2_id)] = old_memory_p1 * memory_retention + learning_rate * 0.2
-    
-    # P2's memory of P1
-    old_memory_p2 = p2["interaction_memory"].get(str(p1_id), 0)
-    p2["interaction_memory"][str(p1_id)] = old_memory_p2 * memory_retention + learning_rate * 0.2
+    if memory is not None:
+        # Shared store applies the retention lazily
+        memory.reinforce(p1_id, p2_id, learning_rate * 0.2)
+    else:
+        # P1's memory of P2
+        old_memory_p1 = p1["interaction_memory"].get(str(p2_id), 0)
+        p1["interaction_memory"][str(p2_id)] = old_memory_p1 * memory_retention + learning_rate * 0.2
+        
+        # P2's memory of P1
+        old_memory_p2 = p2["interaction_memory"].get(str(p1_id), 0)
+        p2["interaction_memory"][str(p1_id)] = old_memory_p2 * memory_retention + learning_rate * 0.2
     
     # Knowledge exchange
     intent_similarity = 1 - abs(p1.get("intent", 0) - p2.get("intent", 0))
@@ -181,20 +263,26 @@ def simulate_interaction(particle1, particle2, learning_rate=0.1):
     if p2["type"] == "adaptive":
         p2["adaptive_score"] += 0.05 * min(1, (p1["knowledge"] + p1["energy"]) / 2)
     
+    # Cluster or composite events change more than knowledge and age
+    restructured = False
+    
     # Cluster formation chance
-    if intent_similarity > 0.8 and random.random() < 0.05:
+    if intent_similarity > 0.8 and rng.random() < 0.05:
         # Try to join/form a cluster
         if p1["cluster_id"] == -1 and p2["cluster_id"] == -1:
             # Both unaffiliated - form new cluster with max ID + 1
             new_cluster_id = max(p1["id"], p2["id"]) + 1
             p1["cluster_id"] = new_cluster_id
             p2["cluster_id"] = new_cluster_id
+            restructured = True
         elif p1["cluster_id"] != -1 and p2["cluster_id"] == -1:
             # First has cluster, second joins
             p2["cluster_id"] = p1["cluster_id"]
+            restructured = True
         elif p1["cluster_id"] == -1 and p2["cluster_id"] != -1:
             # Second has cluster, first joins
             p1["cluster_id"] = p2["cluster_id"]
+            restructured = True
     
     # Possibly create composite particle
     if ((p1["knowledge"] > 1 and p2["knowledge"] > 1) and
@@ -210,12 +298,13 @@ def simulate_interaction(particle1, particle2, learning_rate=0.1):
         # Chance to form
         formation_threshold = 0.6 * entropy_factor * age_factor
         
-        if (random.random() < formation_threshold and
+        if (rng.random() < formation_threshold and
             ((p1["charge"] == "positive" and p2["charge"] != "positive") or
              (p2["charge"] == "positive" and p1["charge"] != "positive"))):
+            restructured = True
             
             # Create composite particle (only one - the other will be reduced)
-            if random.random() < 0.5:
+            if rng.random() < 0.5:
                 p1["type"] = "composite"
                 p1["complexity"] = p1["complexity"] + p2["complexity"] * 0.7
                 p1["energy"] = p1["energy"] + p2["energy"] * 0.5
@@ -224,9 +313,12 @@ def simulate_interaction(particle1, particle2, learning_rate=0.1):
                 p1["energy_capacity"] += p2["energy_capacity"] * 0.5
                 
                 # Merge memories
-                for pid, strength in p2["interaction_memory"].items():
-                    old_strength = p1["interaction_memory"].get(pid, 0)
-                    p1["interaction_memory"][pid] = old_strength + strength * 0.5
+                if memory is not None:
+                    memory.merge(p1_id, p2_id, 0.5)
+                else:
+                    for pid, strength in p2["interaction_memory"].items():
+                        old_strength = p1["interaction_memory"].get(pid, 0)
+                        p1["interaction_memory"][pid] = old_strength + strength * 0.5
                 
                 # Reduce second particle
                 p2["energy"] *= 0.3
@@ -240,127 +332,97 @@ def simulate_interaction(particle1, particle2, learning_rate=0.1):
                 p2["energy_capacity"] += p1["energy_capacity"] * 0.5
                 
                 # Merge memories
-                for pid, strength in p1["interaction_memory"].items():
-                    old_strength = p2["interaction_memory"].get(pid, 0)
-                    p2["interaction_memory"][pid] = old_strength + strength * 0.5
+                if memory is not None:
+                    memory.merge(p2_id, p1_id, 0.5)
+                else:
+                    for pid, strength in p1["interaction_memory"].items():
+                        old_strength = p2["interaction_memory"].get(pid, 0)
+                        p2["interaction_memory"][pid] = old_strength + strength * 0.5
                 
                 # Reduce first particle
                 p1["energy"] *= 0.3
                 p1["knowledge"] *= 0.3
     
+    if tracker is not None:
+        if restructured:
+            tracker.replace(particle1, p1)
+            tracker.replace(particle2, p2)
+        else:
+            tracker.interacted(p1, p2, knowledge_transfer)
+    
     return p1, p2, True
 
 def analyze_particle_clusters(particles):
     """Analyze clusters in the particle system"""
-    # Get all cluster IDs (excluding -1 which means no cluster)
-    cluster_ids = set()
-    for p in particles:
-        if p["cluster_id"] != -1:
-            cluster_ids.add(p["cluster_id"])
-    
-    # Count particles in each cluster
-    cluster_sizes = {}
-    for cid in cluster_ids:
-        size = sum(1 for p in particles if p["cluster_id"] == cid)
-        cluster_sizes[cid] = size
-    
-    # Calculate metrics
-    cluster_count = len(cluster_ids)
-    total_size = sum(cluster_sizes.values())
-    largest_size = max(cluster_sizes.values()) if cluster_sizes else 0
-    avg_cluster_size = total_size / cluster_count if cluster_count > 0 else 0
-    
-    # Calculate cluster stability
-    total_knowledge = 0
-    total_complexity = 0
-    total_age = 0
-    total_clustered_particles = 0
-    
-    for cid in cluster_ids:
-        cluster_particles = [p for p in particles if p["cluster_id"] == cid]
-        total_clustered_particles += len(cluster_particles)
-        
-        for p in cluster_particles:
-            total_knowledge += p["knowledge"]
-            total_complexity += p["complexity"]
-            total_age += p["age"]
-    
-    avg_knowledge = total_knowledge / total_clustered_particles if total_clustered_particles > 0 else 0
-    avg_complexity = total_complexity / total_clustered_particles if total_clustered_particles > 0 else 0
-    avg_age = total_age / total_clustered_particles if total_clustered_particles > 0 else 0
-    
-    # Calculate stability score (0-1)
-    knowledge_factor = min(1, avg_knowledge / 10)
-    complexity_factor = min(1, avg_complexity / 5)
-    age_factor = min(1, avg_age / 500)
-    
-    cluster_stability = (knowledge_factor * 0.4 + complexity_factor * 0.4 + age_factor * 0.2)
-    
-    return {
-        "cluster_count": cluster_count,
-        "average_cluster_size": avg_cluster_size,
-        "largest_cluster_size": largest_size,
-        "cluster_stability": cluster_stability
-    }
+    # Sizes and knowledge/complexity/age sums per cluster in one pass
+    # (cluster ID -1 means no cluster)
+    clusters = ClusterIndex(particles)
+    return clusters.analyze()
 
-def calculate_system_entropy(particles, intent_field):
-    """Calculate the entropy of the entire system"""
-    # Type and charge distribution entropy
-    type_counts = {
-        "standard": 0, "high-energy": 0, "quantum": 0, 
-        "composite": 0, "adaptive": 0
-    }
+def distribution_entropy(counts):
+    """Shannon entropy of a histogram, normalized to 0-1 by its number of bins"""
+    counts = np.asarray(counts, dtype=np.float64)
+    total = counts.sum()
+    if total == 0 or len(counts) < 2:
+        return 0
+    probability = counts[counts > 0] / total
+    return float(-(probability * np.log2(probability)).sum()) / math.log2(len(counts))
+
+def field_entropy(intent_field, bins=None):
+    """
+    Mean binary entropy of the field cells, with values mapped to 0-1
+    
+    With bins set, cells are bucketed into that many equal-width bins and
+    each bucket contributes the entropy at its center, which avoids taking
+    logarithms per cell on very large fields.
+    """
+    field = np.asarray(intent_field)
+    if field.size == 0:
+        return 0
+    if bins is None:
+        # Convert to probability-like values (0-1); 0 and 1 carry no entropy
+        norm = (field.astype(np.float64) + 1) / 2
+        norm = norm[(norm > 0) & (norm < 1)]
+        cell_entropy = -(norm * np.log2(norm) + (1 - norm) * np.log2(1 - norm))
+        return float(cell_entropy.sum()) / field.size
+    
+    index = np.multiply(np.add(field, 1, dtype=np.float32), bins / 2, dtype=np.float32)
+    index = np.clip(index, 0, bins - 1, out=index).astype(np.intp)
+    counts = np.bincount(index.ravel(), minlength=bins)
+    # Cells clamped to the edges of the field have zero entropy
+    counts[0] -= np.count_nonzero(field <= -1)
+    counts[-1] -= np.count_nonzero(field >= 1)
+    centers = (np.arange(bins) + 0.5) / bins
+    bin_entropy = -(centers * np.log2(centers) + (1 - centers) * np.log2(1 - centers))
+    return float(counts @ bin_entropy) / field.size
+
+def calculate_system_entropy(particles, intent_field, field_bins=None):
+    """
+    Calculate the entropy of the entire system
     
-    charge_counts = {"positive": 0, "negative": 0, "neutral": 0}
+    particles is a list of particle dicts or a ParticleArray. field_bins
+    switches the field term to the histogram approximation of field_entropy.
+    """
+    # Type and charge distribution entropy
+    if isinstance(particles, ParticleArray):
+        type_counts = particles.type_counts()
+        charge_counts = particles.charge_counts()
+    else:
+        type_codes = np.fromiter((TYPE_CODES[p["type"]] for p in particles), dtype=np.int8, count=len(particles))
+        charge_codes = np.fromiter((CHARGE_CODES[p["charge"]] for p in particles), dtype=np.int8, count=len(particles))
+        type_counts = np.bincount(type_codes, minlength=len(TYPE_CODES))
+        charge_counts = np.bincount(charge_codes, minlength=len(CHARGE_CODES))
     
-    for p in particles:
-        p_type = p["type"]
-        p_charge = p["charge"]
-        
-        if p_type in type_counts:
-            type_counts[p_type] += 1
-        if p_charge in charge_counts:
-            charge_counts[p_charge] += 1
-    
-    # Calculate type entropy
-    type_entropy = 0
-    total_particles = len(particles)
-    for count in type_counts.values():
-        if count > 0:
-            probability = count / total_particles
-            type_entropy -= probability * math.log2(probability) if probability > 0 else 0
-    
-    # Normalize to 0-1 range
-    max_type_entropy = math.log2(len(type_counts))
-    normalized_type_entropy = type_entropy / max_type_entropy if max_type_entropy > 0 else 0
-    
-    # Calculate charge entropy
-    charge_entropy = 0
-    for count in charge_counts.values():
-        if count > 0:
-            probability = count / total_particles
-            charge_entropy -= probability * math.log2(probability) if probability > 0 else 0
-    
-    # Normalize to 0-1 range
-    max_charge_entropy = math.log2(len(charge_counts))
-    normalized_charge_entropy = charge_entropy / max_charge_entropy if max_charge_entropy > 0 else 0
-    
-    # Field entropy calculation (simplified)
-    field_entropy = 0
-    field_cells = 0
-    
-    for plane in intent_field:
-        for row in plane:
-            for value in row:
-                # Convert to probability-like value (0-1)
-                norm_value = (value + 1) / 2
-                # Shannon entropy for this value
-                if 0 < norm_value < 1:
-                    field_entropy -= (norm_value * math.log2(norm_value or 1e-10) + 
-                                    (1 - norm_value) * math.log2(1 - norm_value or 1e-10))
-                field_cells += 1
-    
-    normalized_field_entropy = field_entropy / field_cells if field_cells > 0 else 0
+    return combine_system_entropy(field_entropy(intent_field, field_bins), type_counts, charge_counts)
+
+# particle_counts keys of the type and charge histograms, in code order
+TYPE_COUNT_KEYS = ("standard", "high_energy", "quantum", "composite", "adaptive")
+CHARGE_COUNT_KEYS = ("positive", "negative", "neutral")
+
+def combine_system_entropy(normalized_field_entropy, type_counts, charge_counts):
+    """Weighted average of the field entropy and the type and charge entropies"""
+    normalized_type_entropy = distribution_entropy(type_counts)
+    normalized_charge_entropy = distribution_entropy(charge_counts)
     
     # Combined entropy (weighted average)
     system_entropy = (normalized_field_entropy * 0.3 + 
@@ -427,11 +489,43 @@ def detect_anomalies(particles, prev_state, curr_state, timestamp):
 
 def run_simulation(max_particles=100, iterations=1000, learning_rate=0.1, 
                  fluctuation_rate=0.01, use_adaptive=False, energy_conservation=False,
-                 probabilistic_intent=False):
-    """Runs a full enhanced simulation"""
+                 probabilistic_intent=False, engine="scalar", field_size=10, seed=None,
+                 sample_every=50, field_entropy_bins=None, anomaly_detector="threshold"):
+    """
+    Runs a full enhanced simulation
+    
+    engine="scalar" calls simulate_interaction once per particle pair;
+    engine="vectorized" keeps particles in a ParticleArray and processes
+    the pairs of each particle in turn with NumPy vector operations.
+    field_size sets the edge length of the cubic intent field.
+    The same config and seed always produce identical output.
+    A data point is recorded every sample_every iterations.
+    field_entropy_bins switches the field entropy to its histogram
+    approximation, for large fields.
+    anomaly_detector="threshold" compares consecutive data points against
+    fixed thresholds; "zscore" or "cusum" instead stream the metrics of
+    every iteration through a StreamingAnomalyDetector.
+    """
+    if engine not in ("scalar", "vectorized"):
+        raise ValueError(f"Unknown simulation engine: {engine}")
+    vectorized = engine == "vectorized"
+    if anomaly_detector not in ("threshold", "zscore", "cusum"):
+        raise ValueError(f"Unknown anomaly detector: {anomaly_detector}")
+    detector = StreamingAnomalyDetector(anomaly_detector) if anomaly_detector != "threshold" else None
+    streams = make_random_streams(seed)
+    placement = streams["placement"]
+    
     # Initialize simulation
-    intent_field = simulate_intent_field(fluctuation_rate=fluctuation_rate, probabilistic=probabilistic_intent)
-    particles = []
+    intent_field = simulate_intent_field(
+        size=field_size,
+        fluctuation_rate=fluctuation_rate,
+        probabilistic=probabilistic_intent,
+        rng=streams["field"]
+    )
+    field_term = field_entropy(intent_field, field_entropy_bins)  # Refreshed whenever the field changes
+    memory = InteractionMemory()
+    particles = ParticleArray(capacity=max_particles, memory=memory) if vectorized else []
+    metrics = ParticleMetrics()  # Running statistics for the scalar engine
     total_interactions = 0
     simulation_time = 0
     anomalies = []
@@ -446,8 +540,12 @@ def run_simulation(max_particles=100, iterations=1000, learning_rate=0.1,
     
     # Create initial particles
     for i in range(max_particles // 2):
-        field_value = intent_field[random.randint(0, 9)][random.randint(0, 9)][random.randint(0, 9)]
-        particles.append(create_particle_from_field(field_value, i, use_adaptive))
+        z, y, x = (placement.randint(0, field_size - 1) for _ in range(3))
+        field_value = float(intent_field[z, y, x])
+        particles.append(create_particle_from_field(field_value, i, use_adaptive, streams["particles"]))
+        if not vectorized:
+            metrics.add(particles[-1])
+    next_id = max_particles // 2  # Ids are never reused, so forgetting a removed id is safe
     
     # Data collection
     time_series_data = []
@@ -458,14 +556,21 @@ def run_simulation(max_particles=100, iterations=1000, learning_rate=0.1,
         
         # Create new particles if needed
         if len(particles) < max_particles:
-            field_value = intent_field[random.randint(0, 9)][random.randint(0, 9)][random.randint(0, 9)]
-            particles.append(create_particle_from_field(field_value, len(particles), use_adaptive))
+            z, y, x = (placement.randint(0, field_size - 1) for _ in range(3))
+            field_value = float(intent_field[z, y, x])
+            particles.append(create_particle_from_field(field_value, next_id, use_adaptive, streams["particles"]))
+            next_id += 1
+            if not vectorized:
+                metrics.add(particles[-1])
         
         # Update intent field
         if iteration % 50 == 0:
-            intent_field = simulate_intent_field(
+            simulate_intent_field(
+                size=field_size,
                 fluctuation_rate=fluctuation_rate,
-                probabilistic=probabilistic_intent
+                probabilistic=probabilistic_intent,
+                out=intent_field,
+                rng=streams["field"]
             )
             
             # Periodically create field from particles (feedback loop)
@@ -475,60 +580,105 @@ def run_simulation(max_particles=100, iterations=1000, learning_rate=0.1,
                 for p in particles:
                     if p["type"] == "composite" or p["type"] == "adaptive":
                         # These particles influence the field
-                        z, y, x = random.randint(0, 9), random.randint(0, 9), random.randint(0, 9)
+                        z, y, x = (placement.randint(0, field_size - 1) for _ in range(3))
                         influence = 0.2 * p["complexity"] * (1 if p["charge"] == "positive" else -1)
-                        intent_field[z][y][x] += influence
-                        intent_field[z][y][x] = max(-1, min(1, intent_field[z][y][x]))
+                        intent_field[z, y, x] = max(-1, min(1, intent_field[z, y, x] + influence))
+            
+            field_term = field_entropy(intent_field, field_entropy_bins)
         
         # Process particle interactions
-        particles_to_remove = []
-        for i in range(len(particles)):
-            # Energy conservation
-            if energy_conservation:
-                particles[i]["energy"] *= (1 - particles[i]["decay_rate"])
-                if particles[i]["energy"] < 0.1:
-                    particles_to_remove.append(i)
-                    continue
-            
-            # Age particles
-            particles[i]["age"] += 1
+        if vectorized:
+            # Energy conservation, aging and all pair interactions, row by row
+            interactions, removed = interact_all_pairs(
+                particles, learning_rate, streams["engine"], energy_conservation
+            )
+            total_interactions += interactions
             
-            # Interactions with other particles
-            for j in range(i + 1, len(particles)):
-                p1, p2, interaction_occurred = simulate_interaction(
-                    particles[i], particles[j], learning_rate
-                )
+            # Remove particles with low energy
+            if removed.any():
+                particles.remove(np.flatnonzero(removed))
+        else:
+            particles_to_remove = []
+            for i in range(len(particles)):
+                # Energy conservation
+                if energy_conservation:
+                    particles[i]["energy"] *= (1 - particles[i]["decay_rate"])
+                    if particles[i]["energy"] < 0.1:
+                        particles_to_remove.append(i)
+                        continue
                 
-                particles[i], particles[j] = p1, p2
+                # Age particles
+                particles[i]["age"] += 1
+                metrics.age(particles[i])
                 
-                if interaction_occurred:
-                    total_interactions += 1
+                # Interactions with other particles
+                for j in range(i + 1, len(particles)):
+                    p1, p2, interaction_occurred = simulate_interaction(
+                        particles[i], particles[j], learning_rate, memory, streams["interactions"], metrics
+                    )
+                    
+                    particles[i], particles[j] = p1, p2
+                    
+                    if interaction_occurred:
+                        total_interactions += 1
+            
+            # Remove particles with low energy
+            if particles_to_remove:
+                memory.forget(particles[i]["id"] for i in particles_to_remove)
+                for i in particles_to_remove:
+                    metrics.discard(particles[i])
+            particles = [p for i, p in enumerate(particles) if i not in particles_to_remove]
         
-        # Remove particles with low energy
-        particles = [p for i, p in enumerate(particles) if i not in particles_to_remove]
+        # Apply this iteration's memory updates and evict weak edges
+        memory.tick()
+        
+        # Stream this iteration's metrics through the online detector
+        if detector is not None:
+            if vectorized:
+                stream_counts = array_particle_counts(particles)
+                cluster_ids = particles.cluster_id[:len(particles)]
+                cluster_count = len(np.unique(cluster_ids[cluster_ids != -1]))
+            else:
+                stream_counts = metrics.counts
+                cluster_count = len(metrics.clusters)
+            stream_state = {
+                "entropy": combine_system_entropy(
+                    field_term,
+                    [stream_counts[key] for key in TYPE_COUNT_KEYS],
+                    [stream_counts[key] for key in CHARGE_COUNT_KEYS]
+                ),
+                "cluster_count": cluster_count,
+                "adaptive_count": stream_counts["adaptive"],
+                "composite_count": stream_counts["composite"],
+            }
+            anomalies.extend(detector.update(stream_state, simulation_time, len(particles)))
         
         # Collect data every few iterations
-        if iteration % 50 == 0:
+        if iteration % sample_every == 0:
             # Calculate basic statistics
-            particle_counts = {
-                "positive": sum(1 for p in particles if p["charge"] == "positive"),
-                "negative": sum(1 for p in particles if p["charge"] == "negative"),
-                "neutral": sum(1 for p in particles if p["charge"] == "neutral"),
-                "high_energy": sum(1 for p in particles if p["type"] == "high-energy"),
-                "quantum": sum(1 for p in particles if p["type"] == "quantum"),
-                "standard": sum(1 for p in particles if p["type"] == "standard"),
-                "composite": sum(1 for p in particles if p["type"] == "composite"),
-                "adaptive": sum(1 for p in particles if p["type"] == "adaptive")
-            }
-            
-            # Advanced analytics
-            cluster_analysis = analyze_particle_clusters(particles)
-            system_entropy = calculate_system_entropy(particles, intent_field)
+            if vectorized:
+                n = len(particles)
+                particle_counts = array_particle_counts(particles)
+                cluster_analysis = analyze_array_clusters(particles)
+                with np.errstate(over="ignore", invalid="ignore"):
+                    avg_knowledge = float(particles.knowledge[:n].sum()) / max(1, n)
+                    avg_complexity = float(particles.complexity[:n].sum()) / max(1, n)
+                max_complexity = float(particles.complexity[:n].max()) if n else 1
+            else:
+                # Running statistics make this snapshot independent of the particle count
+                snapshot = metrics.snapshot(particles)
+                particle_counts = snapshot["particle_counts"]
+                cluster_analysis = snapshot["cluster_analysis"]
+                avg_knowledge = snapshot["avg_knowledge"]
+                avg_complexity = snapshot["avg_complexity"]
+                max_complexity = snapshot["max_complexity"]
             
-            # Calculate advanced metrics
-            avg_knowledge = sum(p["knowledge"] for p in particles) / max(1, len(particles))
-            avg_complexity = sum(p["complexity"] for p in particles) / max(1, len(particles))
-            max_complexity = max([p["complexity"] for p in particles]) if particles else 1
+            # The field term is cached since the field last changed
+            system_entropy = combine_system_entropy(
+                field_term,
+                [particle_counts[key] for key in TYPE_COUNT_KEYS],
+                [particle_counts[key] for key in CHARGE_COUNT_KEYS]
+            )
             
             # Current state for anomaly detection
             curr_state = {
@@ -539,7 +689,7 @@ def run_simulation(max_particles=100, iterations=1000, learning_rate=0.1,
             }
             
             # Detect anomalies after initial stabilization
-            if iteration > 100:
+            if detector is None and iteration > 100:
                 new_anomalies = detect_anomalies(particles, prev_state, curr_state, simulation_time)
                 anomalies.extend(new_anomalies)
             
@@ -583,8 +733,79 @@ def run_simulation(max_particles=100, iterations=1000, learning_rate=0.1,
     
     return time_series_data, anomalies
 
+# Config keys that map directly onto run_simulation arguments
+SIMULATION_PARAMS = (
+    "max_particles", "learning_rate", "fluctuation_rate", "use_adaptive",
+    "energy_conservation", "probabilistic_intent", "engine", "field_size", "seed",
+    "sample_every", "field_entropy_bins", "anomaly_detector"
+)
+
+def run_config(config, iterations=1000, cache=None):
+    """
+    Runs the simulation described by a config dict
+    
+    Seeded configs are looked up in and stored to `cache` (a ResultCache)
+    when one is given; unseeded runs are never cached.
+    """
+    params = {key: config[key] for key in SIMULATION_PARAMS if key in config}
+    if cache is None or params.get("seed") is None:
+        return run_simulation(iterations=iterations, **params)
+    
+    key = cache_key(params, iterations, ENGINE_VERSION)
+    cached = cache.get(key)
+    if cached is not None:
+        print(f"Using cached result for {config.get('name', key)}")
+        return cached
+    simulation_data, anomalies = run_simulation(iterations=iterations, **params)
+    cache.put(key, simulation_data, anomalies)
+    return simulation_data, anomalies
+
+# Result file formats: one JSON document, or NPZ columns plus a JSON sidecar
+RESULT_FORMATS = ("json", "npz")
+
+def result_filename(config, timestamp, output_dir=DATA_DIR, fmt="json"):
+    """Path of the simulation_<name>_<timestamp>.<fmt> file for a config"""
+    return os.path.join(output_dir, f"simulation_{config['name']}_{timestamp}.{fmt}")
+
+def save_simulation_result(config, simulation_data, anomalies, timestamp, output_dir=DATA_DIR, fmt="json"):
+    """Saves one simulation result, replacing the file atomically"""
+    if fmt not in RESULT_FORMATS:
+        raise ValueError(f"Unknown result format: {fmt}")
+    filename = result_filename(config, timestamp, output_dir, fmt)
+    if fmt == "npz":
+        return save_columnar_result(filename[:-len(".npz")], config, simulation_data, anomalies, timestamp)
+    temp_filename = filename + ".tmp"
+    with open(temp_filename, "w") as f:
+        json.dump({
+            "config": config,
+            "data": simulation_data,
+            "anomalies": anomalies,
+            "timestamp": timestamp
+        }, f, indent=2)
+    os.replace(temp_filename, filename)
+    return filename
+
 def main():
     """Main function to run multiple simulations with different configurations"""
+    parser = argparse.ArgumentParser(description='Run the standard universe simulation configs.')
+    parser.add_argument('output_dir', nargs='?', default=DATA_DIR, help='Output directory (default: ./data)')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='Seed shared by every config; only seeded runs are cached (default: unseeded)')
+    parser.add_argument('--no-cache', action='store_true', help='Always rerun seeded configs instead of reusing cached results')
+    parser.add_argument('--cache-dir', default=None, help='Result cache directory (default: ./data/cache)')
+    parser.add_argument('--format', choices=RESULT_FORMATS, default='json',
+                        help='Result file format: json, or npz columns with a .meta sidecar (default: json)')
+    parser.add_argument('--profile-startup', action='store_true', help='Print the import time of each module and exit')
+    args = parser.parse_args()
+    if startup_timer is not None:
+        startup_timer.report()
+        return
+    
+    os.makedirs(args.output_dir, exist_ok=True)
+    cache = None
+    if args.seed is not None and not args.no_cache:
+        cache = ResultCache(args.cache_dir) if args.cache_dir else ResultCache()
+    
     print("Starting enhanced universe simulation data collection...")
     
     # Run multiple simulations with different configurations
@@ -631,38 +852,23 @@ def main():
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     
     for config in simulation_configs:
+        config["seed"] = args.seed
         print(f"Running simulation: {config['name']}...")
-        simulation_data, anomalies = run_simulation(
-            max_particles=config["max_particles"],
-            iterations=1000,
-            learning_rate=config["learning_rate"],
-            fluctuation_rate=config["fluctuation_rate"],
-            use_adaptive=config["use_adaptive"],
-            energy_conservation=config["energy_conservation"],
-            probabilistic_intent=config["probabilistic_intent"]
-        )
+        simulation_data, anomalies = run_config(config, iterations=1000, cache=cache)
         
         # Save data to file
-        filename = f"{DATA_DIR}/simulation_{config['name']}_{timestamp}.json"
-        with open(filename, "w") as f:
-            json.dump({
-                "config": config,
-                "data": simulation_data,
-                "anomalies": anomalies,
-                "timestamp": timestamp
-            }, f, indent=2)
+        filename = save_simulation_result(config, simulation_data, anomalies, timestamp, args.output_dir, args.format)
         
         print(f"Saved simulation data to {filename}")
     
-    # Create a summary file
+    # Record the run in the summary log
     summary_data = {
         "timestamp": timestamp,
         "simulations": [c["name"] for c in simulation_configs],
         "latest_run": timestamp
     }
     
-    with open(f"{DATA_DIR}/summary.json", "w") as f:
-        json.dump(summary_data, f, indent=2)
+    record_run(args.output_dir, summary_data)
     
     print("Enhanced data collection complete!")
 
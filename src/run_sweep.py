@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Parameter Sweep Runner
+Fans a grid or list of simulation configs out over worker processes and
+streams each finished result to disk as simulation_<name>_<timestamp>.json.
+"""
+
+import os
+import json
+import argparse
+import itertools
+import numpy as np
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import run_simulation as simulation
+
+# Hidden so the compile and organize scripts, which read every *.json file, skip it
+SWEEP_MANIFEST_PREFIX = ".sweep_"
+
+
+def expand_grid(base, grid):
+    """Builds one config per combination of the values in grid"""
+    keys = sorted(grid)
+    configs = []
+    for values in itertools.product(*(grid[key] for key in keys)):
+        config = dict(base)
+        config.update(zip(keys, values))
+        suffix = "_".join(f"{key}-{value}" for key, value in zip(keys, values))
+        config["name"] = f"{base.get('name', 'sweep')}_{suffix}" if suffix else base.get("name", "sweep")
+        configs.append(config)
+    return configs
+
+
+def load_sweep_configs(path):
+    """
+    Loads configs from a JSON file holding either a list of configs or
+    {"base": {...}, "grid": {"param": [values, ...]}}
+    """
+    with open(path, "r") as f:
+        spec = json.load(f)
+    if isinstance(spec, list):
+        return spec
+    return expand_grid(spec.get("base", {}), spec.get("grid", {}))
+
+
+def sweep_manifest_path(output_dir, timestamp):
+    return os.path.join(output_dir, f"{SWEEP_MANIFEST_PREFIX}{timestamp}")
+
+
+def load_sweep_manifest(output_dir, timestamp):
+    """The manifest a sweep wrote at its start, or None"""
+    path = sweep_manifest_path(output_dir, timestamp)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def save_sweep_manifest(output_dir, timestamp, seed, configs):
+    path = sweep_manifest_path(output_dir, timestamp)
+    temp_file = f"{path}.{os.getpid()}.tmp"
+    with open(temp_file, "w") as f:
+        json.dump({"timestamp": timestamp, "seed": seed,
+                   "configs": [config["name"] for config in configs]}, f, indent=2)
+    os.replace(temp_file, path)
+
+
+def run_sweep_config(config, iterations, timestamp, output_dir, fmt="json"):
+    """Worker entry point: runs one seeded config and writes its result file"""
+    simulation_data, anomalies = simulation.run_config(config, iterations=iterations)
+    return simulation.save_simulation_result(config, simulation_data, anomalies, timestamp, output_dir, fmt)
+
+
+def run_sweep(configs, output_dir=simulation.DATA_DIR, iterations=1000, max_workers=None,
+              seed=None, timestamp=None, fmt="json"):
+    """
+    Runs every config in a process pool and returns the written filenames.
+
+    Each config without a seed of its own gets one spawned from `seed`, so
+    a sweep is reproducible regardless of how configs are scheduled. The
+    sweep seed is saved in a manifest next to the results. Passing the
+    timestamp of an interrupted sweep resumes it with the saved seed:
+    configs whose result file already exists are skipped.
+    """
+    names = [config["name"] for config in configs]
+    if len(set(names)) != len(names):
+        raise ValueError("Sweep config names must be unique")
+    os.makedirs(output_dir, exist_ok=True)
+    timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+    manifest = load_sweep_manifest(output_dir, timestamp)
+    if manifest is not None:
+        if seed is not None and seed != manifest["seed"]:
+            raise ValueError(f"Sweep {timestamp} was run with seed {manifest['seed']}, not {seed}")
+        seed = manifest["seed"]
+    else:
+        if seed is None:
+            seed = int(np.random.SeedSequence().entropy % (2**32))
+        save_sweep_manifest(output_dir, timestamp, seed, configs)
+    config_seeds = [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(seed).spawn(len(configs))]
+
+    filenames = []
+    pending = []
+    for config, config_seed in zip(configs, config_seeds):
+        filename = simulation.result_filename(config, timestamp, output_dir, fmt)
+        if os.path.exists(filename):
+            print(f"Skipping {config['name']}: already saved to {filename}")
+            filenames.append(filename)
+        else:
+            pending.append(config if config.get("seed") is not None else dict(config, seed=config_seed))
+
+    print(f"Running {len(pending)} of {len(configs)} sweep configs (timestamp {timestamp}, seed {seed})...")
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(run_sweep_config, config, iterations, timestamp, output_dir, fmt): config
+            for config in pending
+        }
+        for future in as_completed(futures):
+            config = futures[future]
+            try:
+                filename = future.result()
+            except Exception as e:
+                print(f"Error running {config['name']}: {e}")
+                continue
+            filenames.append(filename)
+            print(f"Saved simulation data to {filename}")
+
+    return filenames
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a parameter sweep of universe simulations in parallel.')
+    parser.add_argument('sweep_file', help='JSON file with a list of configs or a {"base", "grid"} spec')
+    parser.add_argument('--output_dir', default=simulation.DATA_DIR, help='Output directory (default: ./data)')
+    parser.add_argument('--iterations', type=int, default=1000, help='Iterations per simulation (default: 1000)')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='Sweep seed; configs without a seed get one spawned from it')
+    parser.add_argument('--resume', metavar='TIMESTAMP', default=None,
+                        help='Resume the sweep with this timestamp and its saved seed, skipping finished configs')
+    parser.add_argument('--format', choices=simulation.RESULT_FORMATS, default='json',
+                        help='Result file format (default: json)')
+
+    args = parser.parse_args()
+    configs = load_sweep_configs(args.sweep_file)
+    run_sweep(configs, output_dir=args.output_dir, iterations=args.iterations,
+              max_workers=args.workers, seed=args.seed, timestamp=args.resume, fmt=args.format)
+
+
+if __name__ == "__main__":
+    main()
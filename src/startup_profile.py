@@ -0,0 +1,63 @@
+"""
+Import-time profiling for the simulation scripts.
+Wraps the import statement to time every module the first time it is
+loaded, so --profile-startup can report where a cold start spends its
+time without rerunning the script under python -X importtime.
+"""
+
+import sys
+import time
+import builtins
+
+
+class ImportTimer:
+    """Records the inclusive and self time of each first-time import"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.timings = {}  # module name -> [inclusive seconds, self seconds]
+        self.stack = []  # [name, start, time spent in nested imports]
+        self.import_time = 0.0  # Time in outermost imports
+        self.original_import = None
+
+    def install(self):
+        self.original_import = builtins.__import__
+        builtins.__import__ = self._import
+        return self
+
+    def uninstall(self):
+        if self.original_import is not None:
+            builtins.__import__ = self.original_import
+            self.original_import = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level or name in sys.modules:
+            return self.original_import(name, globals, locals, fromlist, level)
+        frame = [name, time.perf_counter(), 0.0]
+        self.stack.append(frame)
+        try:
+            return self.original_import(name, globals, locals, fromlist, level)
+        finally:
+            self.stack.pop()
+            elapsed = time.perf_counter() - frame[1]
+            self.timings[name] = [elapsed, elapsed - frame[2]]
+            if self.stack:
+                self.stack[-1][2] += elapsed
+            else:
+                self.import_time += elapsed
+
+    def report(self, top=15):
+        """Prints the slowest imports and the time since the timer started"""
+        self.uninstall()
+        total = time.perf_counter() - self.start
+        print(f"Startup: {total * 1000:.1f} ms, of which imports {self.import_time * 1000:.1f} ms")
+        print(f"{'module':<40} {'cumulative ms':>14} {'self ms':>10}")
+        ranked = sorted(self.timings.items(), key=lambda item: item[1][0], reverse=True)
+        for name, (inclusive, own) in ranked[:top]:
+            print(f"{name:<40} {inclusive * 1000:>14.1f} {own * 1000:>10.1f}")
+
+
+def profile_startup(argv=None, flag="--profile-startup"):
+    """An installed ImportTimer when argv holds the flag, else None"""
+    argv = sys.argv if argv is None else argv
+    return ImportTimer().install() if flag in argv else None
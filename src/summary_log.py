@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Append-only JSON Lines summary log.
+Each save appends one record as a single line to summary.jsonl instead of
+rewriting a JSON file with the whole history, so a save costs O(record)
+and a crash can at worst leave one truncated last line, which readers
+skip. Compaction rewrites the log through a temporary file and an atomic
+rename; readers stream the log to tail it or select a timestamp range.
+"""
+
+import os
+import json
+import argparse
+from datetime import datetime
+
+SUMMARY_LOG_NAME = "summary.jsonl"
+SUMMARY_SNAPSHOT_NAME = "summary.json"  # Latest run only, read by the web app
+
+TIMESTAMP_FORMATS = ("%Y%m%d_%H%M%S", "%Y%m%d")
+TAIL_BLOCK_SIZE = 64 * 1024
+
+
+def parse_timestamp(value):
+    """Datetime for an ISO or YYYYmmdd_HHMMSS timestamp, None if unparseable"""
+    if isinstance(value, datetime):
+        return value
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        pass
+    for fmt in TIMESTAMP_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            pass
+    return None
+
+
+def append_summary(log_path, record):
+    """Appends one record to the log as a single line"""
+    line = (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+    # One write on an O_APPEND descriptor, so concurrent writers never interleave lines
+    fd = os.open(log_path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+    try:
+        size = os.fstat(fd).st_size
+        if size and os.pread(fd, 1, size - 1) != b"\n":
+            line = b"\n" + line  # End a line truncated by a crash so this record stays intact
+        os.write(fd, line)
+    finally:
+        os.close(fd)
+
+
+def _parse_line(line):
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None  # Truncated by a crash mid-append
+
+
+def iter_summary(log_path):
+    """Yields every intact record in append order"""
+    if not os.path.exists(log_path):
+        return
+    with open(log_path, "rb") as f:
+        for line in f:
+            record = _parse_line(line)
+            if record is not None:
+                yield record
+
+
+def read_summary(log_path, start=None, end=None):
+    """
+    Yields the records whose timestamp lies in [start, end], streaming the
+    log. start and end are datetimes or timestamp strings; either may be
+    None, and records without a readable timestamp are skipped when a
+    bound is given.
+    """
+    start, end = parse_timestamp(start), parse_timestamp(end)
+    for record in iter_summary(log_path):
+        if start is None and end is None:
+            yield record
+            continue
+        when = parse_timestamp(record.get("timestamp")) if isinstance(record, dict) else None
+        if when is None:
+            continue
+        if (start is None or when >= start) and (end is None or when <= end):
+            yield record
+
+
+def tail_summary(log_path, n=10):
+    """The last n intact records, reading the log backwards from its end"""
+    if n <= 0 or not os.path.exists(log_path):
+        return []
+    records = []
+    with open(log_path, "rb") as f:
+        position = f.seek(0, os.SEEK_END)
+        remainder = b""
+        while position > 0 and len(records) < n:
+            size = min(TAIL_BLOCK_SIZE, position)
+            position -= size
+            f.seek(position)
+            lines = (f.read(size) + remainder).split(b"\n")
+            # The first piece may be the end of a line that starts in an earlier block
+            remainder = lines.pop(0) if position > 0 else b""
+            for line in reversed(lines):
+                record = _parse_line(line) if line.strip() else None
+                if record is not None:
+                    records.append(record)
+                    if len(records) == n:
+                        break
+    records.reverse()
+    return records
+
+
+def compact_summary(log_path, keep=None):
+    """
+    Rewrites the log without truncated lines, keeping only the last `keep`
+    records if given, and atomically replaces it. Records appended by
+    another process while compacting are lost, so compact when no
+    simulation is writing.
+    """
+    if keep is not None:
+        records = tail_summary(log_path, keep)
+    else:
+        records = iter_summary(log_path)
+    temp_file = f"{log_path}.{os.getpid()}.tmp"
+    count = 0
+    with open(temp_file, "w") as f:
+        for record in records:
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+            count += 1
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_file, log_path)
+    return count
+
+
+def record_run(output_dir, summary_data):
+    """
+    Appends a run summary to output_dir's log and atomically replaces the
+    summary.json snapshot of the latest run
+    """
+    append_summary(os.path.join(output_dir, SUMMARY_LOG_NAME), summary_data)
+    snapshot_file = os.path.join(output_dir, SUMMARY_SNAPSHOT_NAME)
+    temp_file = f"{snapshot_file}.{os.getpid()}.tmp"
+    with open(temp_file, "w") as f:
+        json.dump(summary_data, f, indent=2)
+    os.replace(temp_file, snapshot_file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Query or compact a summary.jsonl log.')
+    parser.add_argument('log', nargs='?', default=os.path.join("data", SUMMARY_LOG_NAME), help='Summary log path')
+    parser.add_argument('--tail', type=int, default=None, help='Print the last N records')
+    parser.add_argument('--start', default=None, help='Earliest timestamp to print')
+    parser.add_argument('--end', default=None, help='Latest timestamp to print')
+    parser.add_argument('--compact', action='store_true', help='Drop truncated lines and rewrite the log')
+    parser.add_argument('--keep', type=int, default=None, help='With --compact, keep only the last N records')
+
+    args = parser.parse_args()
+    if args.compact:
+        count = compact_summary(args.log, args.keep)
+        print(f"Compacted {args.log} to {count} records")
+        return
+    if args.tail is not None:
+        records = tail_summary(args.log, args.tail)
+    else:
+        records = read_summary(args.log, args.start, args.end)
+    for record in records:
+        print(json.dumps(record))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import json
+import os
+
+import compile_data
+import organize_files
+from columnar_output import result_paths, save_columnar_result, load_columnar_result
+from run_simulation import save_simulation_result
+
+CONFIG = {"name": "baseline", "max_particles": 10}
+DATA = [{"timestamp": 1, "total_particles": 5, "particle_counts": {"positive": 2}},
+        {"timestamp": 51, "total_particles": 6, "particle_counts": {"positive": 3}}]
+
+
+def write_results(directory):
+    """One JSON result, one columnar result and a sidecar left by an earlier version"""
+    save_simulation_result(CONFIG, DATA, [], "20260101_000000", directory, "json")
+    save_simulation_result(CONFIG, DATA, [], "20260101_000001", directory, "npz")
+    with open(os.path.join(directory, "simulation_baseline_20260101_000002.meta.json"), "w") as f:
+        json.dump({"config": CONFIG, "columns": [], "samples": 0}, f)
+
+
+def test_columnar_round_trip(tmp_path):
+    base = str(tmp_path / "simulation_baseline_20260101_000000")
+    npz_path = save_columnar_result(base, CONFIG, DATA, [], "20260101_000000")
+    assert not result_paths(base)[1].endswith(".json")
+    result = load_columnar_result(npz_path)
+    assert result["config"] == CONFIG
+    assert result["data"] == DATA
+
+
+def test_compile_skips_sidecars(tmp_path):
+    source = tmp_path / "source"
+    source.mkdir()
+    write_results(str(source))
+
+    compile_data.compile_simulation_data(str(source), str(tmp_path / "default"))
+    [compiled] = (tmp_path / "default").glob("simulation_compiled_*.json")
+    with open(compiled) as f:
+        assert len(json.load(f)["data"]) == 1
+
+    compile_data.compile_simulation_data_stream(str(source), str(tmp_path / "stream"), workers=1)
+    with open(tmp_path / "stream" / compile_data.STREAM_OUTPUT_NAME) as f:
+        assert len(f.readlines()) == 1
+
+
+def test_organize_skips_sidecars(tmp_path):
+    write_results(str(tmp_path))
+    organize_files.organize_files(str(tmp_path))
+    organized = sorted(path.name for path in (tmp_path / "baseline" / "20260101").iterdir())
+    assert organized == ["simulation_baseline_20260101_000000.json",
+                         "simulation_baseline_20260101_000000.pdf"]
@@ -0,0 +1,17 @@
+import json
+
+import pytest
+
+import organize_files
+
+
+@pytest.mark.parametrize("transfer, action", [("copy", "Copied"), ("link", "Linked"), ("move", "Moved")])
+def test_logs_the_transfer_performed(tmp_path, capsys, transfer, action):
+    name = "simulation_baseline_20260101_000000.json"
+    with open(tmp_path / name, "w") as f:
+        json.dump({"config": {"name": "baseline"}, "data": []}, f)
+
+    organize_files.organize_files(str(tmp_path), transfer=transfer)
+    assert f"{action} {name} to " in capsys.readouterr().out
+    assert (tmp_path / "baseline" / "20260101" / name).exists()
+    assert (tmp_path / name).exists() == (transfer != "move")
@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+from particle_array import ParticleArray, DICT_KEYS, CHARGE_CODES, TYPE_CODES
+from run_simulation import create_particle_from_field
+
+
+def make_dicts(count=20, seed=0):
+    rng = random.Random(seed)
+    particles = [create_particle_from_field(rng.uniform(-1, 1), i, True, rng) for i in range(count)]
+    for p in particles:
+        p["knowledge"] = rng.random() * 5
+        p["cluster_id"] = rng.choice([-1, 3, 7])
+        p["age"] = rng.randint(0, 500)
+        partners = rng.sample(range(count), 3)
+        p["interaction_memory"] = {str(other): rng.random() for other in partners if other != p["id"]}
+    return particles
+
+
+def test_dict_round_trip():
+    particles = make_dicts()
+    exported = ParticleArray.from_dicts(particles).to_dicts()
+    assert len(exported) == len(particles)
+    for original, restored in zip(particles, exported):
+        assert tuple(restored.keys()) == DICT_KEYS
+        for key in DICT_KEYS:
+            if key == "interaction_memory":
+                assert restored[key].keys() == original[key].keys()
+                for other, strength in original[key].items():
+                    assert restored[key][other] == pytest.approx(strength, rel=1e-6)  # Stored as float32
+            else:
+                assert restored[key] == original[key]
+                assert type(restored[key]) is type(original[key])
+
+
+def test_views_write_through_to_columns():
+    array = ParticleArray.from_dicts(make_dicts(5))
+    view = array[-1]
+    view["charge"] = "negative"
+    view["type"] = "composite"
+    view["knowledge"] = 2.5
+    assert array.charge[4] == CHARGE_CODES["negative"]
+    assert array.type[4] == TYPE_CODES["composite"]
+    assert array.to_dicts()[4]["knowledge"] == 2.5
+    with pytest.raises(IndexError):
+        array[5]
+
+
+def test_append_grows_and_remove_compacts():
+    particles = make_dicts(12)
+    array = ParticleArray(capacity=1)
+    for p in particles:
+        array.append(p)
+    assert len(array) == 12 and array.capacity >= 12
+
+    array.remove([0, 5, 11])
+    kept = [p for p in particles if p["id"] not in (0, 5, 11)]
+    assert [p["id"] for p in array.to_dicts()] == [p["id"] for p in kept]
+    assert [p["knowledge"] for p in array.to_dicts()] == [p["knowledge"] for p in kept]
+    assert array.charge_counts().sum() == array.type_counts().sum() == 9
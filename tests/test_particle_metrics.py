@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+from interaction_memory import InteractionMemory
+from particle_metrics import ParticleMetrics, CHARGE_KEYS, TYPE_KEYS, COUNT_KEYS
+from run_simulation import analyze_particle_clusters, create_particle_from_field, simulate_interaction
+
+
+def rescan(particles):
+    """The snapshot metrics recomputed from scratch"""
+    counts = dict.fromkeys(COUNT_KEYS, 0)
+    for p in particles:
+        counts[CHARGE_KEYS[p["charge"]]] += 1
+        counts[TYPE_KEYS[p["type"]]] += 1
+    total = len(particles)
+    return {
+        "particle_counts": counts,
+        "total_particles": total,
+        "avg_knowledge": sum(p["knowledge"] for p in particles) / max(1, total),
+        "avg_complexity": sum(p["complexity"] for p in particles) / max(1, total),
+        "max_complexity": max((p["complexity"] for p in particles), default=1),
+        "cluster_analysis": analyze_particle_clusters(particles)
+    }
+
+
+def assert_snapshot_matches(snapshot, expected):
+    assert snapshot["particle_counts"] == expected["particle_counts"]
+    assert snapshot["total_particles"] == expected["total_particles"]
+    for key in ("avg_knowledge", "avg_complexity", "max_complexity"):
+        assert snapshot[key] == pytest.approx(expected[key], rel=1e-9)
+    assert snapshot["cluster_analysis"].keys() == expected["cluster_analysis"].keys()
+    for key, value in expected["cluster_analysis"].items():
+        assert snapshot["cluster_analysis"][key] == pytest.approx(value, rel=1e-9, abs=1e-12)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_running_metrics_match_a_full_rescan(seed):
+    rng = random.Random(seed)
+    memory = InteractionMemory()
+    particles = []
+    metrics = ParticleMetrics()
+    next_id = 0
+    for iteration in range(50):
+        # Grow the system, then interact every pair like the scalar loop
+        for _ in range(2):
+            particles.append(create_particle_from_field(rng.uniform(-1, 1), next_id, True, rng))
+            metrics.add(particles[-1])
+            next_id += 1
+        for i in range(len(particles)):
+            particles[i]["age"] += 1
+            metrics.age(particles[i])
+            for j in range(i + 1, len(particles)):
+                particles[i], particles[j], _ = simulate_interaction(
+                    particles[i], particles[j], 0.1, memory, rng, metrics)
+        memory.tick()
+
+        # Remove a few particles, including clustered ones
+        removed = set(rng.sample(range(len(particles)), iteration % 2))
+        for i in removed:
+            metrics.discard(particles[i])
+        memory.forget(particles[i]["id"] for i in removed)
+        particles = [p for i, p in enumerate(particles) if i not in removed]
+
+        if iteration % 10 == 9:
+            assert_snapshot_matches(metrics.snapshot(particles), rescan(particles))
@@ -0,0 +1,109 @@
+import importlib
+import os
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def digest(tmp_path, monkeypatch):
+    """Data_Digest2 with its data and checkpoint directories under tmp_path"""
+    monkeypatch.chdir(tmp_path)  # The module creates ./data on import and writes its output there
+    module = importlib.import_module("Data_Digest2")
+    os.makedirs(module.current_data_dir, exist_ok=True)  # Made on the first import only
+    monkeypatch.setattr(module, "checkpoint_dir", str(tmp_path / "checkpoints"))
+    monkeypatch.setattr(module, "checkpoint_interval", 1e9)  # Only the checkpoint written at the end of a run
+    monkeypatch.setattr(module, "intent_field_scale", 0.05)
+    monkeypatch.setattr(module, "intent_field_mode", "dense")
+    return module
+
+
+def reset(digest):
+    digest.particle_system.clear()
+    digest.total_interactions = 0
+
+
+def snapshot(digest):
+    n = len(digest.particle_system)
+    state = {name: getattr(digest.particle_system, name)[:n].copy()
+             for name in digest.particle_system.array_names}
+    state["particle_types"] = list(digest.particle_system.particle_types)
+    state["total_interactions"] = digest.total_interactions
+    if digest.lazy_intent_field is not None:
+        state["cells"] = dict(digest.lazy_intent_field.cells)
+        state["field_stats"] = dict(digest.intent_field_stats(), version=None)  # Versions are per process
+    else:
+        state["field"] = np.array(digest.intent_field)
+    return state
+
+
+def test_particle_views_write_through(digest):
+    system = digest.ParticleSystem(capacity=1)
+    first = digest.Particle(1, 2, 3, "positive", [0.5, 0, 0], system=system)
+    second = digest.Particle(4, 5, 6, "negative", [0, 1, 0], (10, 20, 30), system=system)
+    assert len(system) == 2 and len(system.position) >= 2
+    second.x += 1
+    second.momentum[2] = 2
+    second.color = (1, 2, 3)
+    first.knowledge_gained = 0.25
+    assert system.position[1].tolist() == [5, 5, 6]
+    assert system.momentum[1].tolist() == [0, 1, 2]
+    assert second.color == (1, 2, 3)
+    assert system.knowledge_gained[0] == 0.25
+    assert system.charge.tolist()[:2] == [digest.POSITIVE_CHARGE, digest.NEGATIVE_CHARGE]
+    assert first.particle_type == "positive"
+
+
+@pytest.mark.parametrize("mode, engine", [("dense", "batched"), ("lazy", "batched"), ("dense", "objects")])
+def test_resume_matches_uninterrupted_run(digest, monkeypatch, tmp_path, mode, engine):
+    monkeypatch.setattr(digest, "intent_field_mode", mode)
+    reset(digest)
+    digest.run(headless=True, max_frames=600, seed=7, engine=engine)
+    expected = snapshot(digest)
+    assert len(expected["particle_types"]) > 10
+
+    monkeypatch.setattr(digest, "checkpoint_dir", str(tmp_path / "interrupted"))
+    reset(digest)
+    digest.run(headless=True, max_frames=300, seed=7, engine=engine)
+    checkpoint = digest.latest_checkpoint()
+    assert checkpoint.endswith("_00000300")
+    # Start the resume from unrelated state, as a new process would
+    reset(digest)
+    digest.seed_random_streams(12345)
+    digest.run(headless=True, max_frames=600, resume=checkpoint, engine=engine)
+    actual = snapshot(digest)
+
+    assert actual.keys() == expected.keys()
+    for key, value in expected.items():
+        if isinstance(value, np.ndarray):
+            np.testing.assert_array_equal(actual[key], value)
+        else:
+            assert actual[key] == value
+
+
+def test_resume_reports_throughput_of_its_own_frames(digest):
+    reset(digest)
+    digest.run(headless=True, max_frames=300, seed=7)
+    checkpoint = digest.latest_checkpoint()
+    reset(digest)
+    report = digest.run(headless=True, max_frames=400, resume=checkpoint)
+
+    # The 300 restored frames were not run by this call
+    assert report["frames"] == 100
+    assert report["frames_per_second"] == pytest.approx(100 / report["elapsed_seconds"])
+
+
+def test_neighbour_pairs_match_brute_force(digest):
+    rng = np.random.default_rng(0)
+    system = digest.ParticleSystem()
+    for _ in range(400):
+        digest.Particle(*rng.uniform(-100, 300, 3), rng.choice(["positive", "negative", "neutral"]), [0, 0, 0],
+                        system=system)
+    radius_sq = rng.choice([30.0, 50.0, 80.0], len(system)) ** 2
+    i, j = system.neighbour_pairs(radius_sq)
+
+    position = system.position[:len(system)]
+    near = ((position[None] - position[:, None]) ** 2).sum(axis=-1) < radius_sq[:, None]
+    np.fill_diagonal(near, False)
+    assert len(i) == near.sum() == len(set(zip(i.tolist(), j.tolist())))
+    assert near[i, j].all()
@@ -0,0 +1,30 @@
+import pytest
+
+import run_simulation as simulation
+
+
+@pytest.mark.parametrize("engine", ["scalar", "vectorized"])
+def test_particle_ids_are_not_reused_after_removals(monkeypatch, engine):
+    created = []
+    forgotten = []
+    create = simulation.create_particle_from_field
+    forget = simulation.InteractionMemory.forget
+
+    def record_create(field_value, id, *args, **kwargs):
+        created.append(id)
+        return create(field_value, id, *args, **kwargs)
+
+    def record_forget(memory, particle_ids):
+        particle_ids = list(particle_ids)
+        forgotten.extend(int(pid) for pid in particle_ids)
+        return forget(memory, particle_ids)
+
+    monkeypatch.setattr(simulation, "create_particle_from_field", record_create)
+    monkeypatch.setattr(simulation.InteractionMemory, "forget", record_forget)
+    simulation.run_simulation(max_particles=20, iterations=300, engine=engine, seed=3,
+                              energy_conservation=True, sample_every=100)
+
+    # Particles were removed and replaced, and no replacement took a removed id
+    assert forgotten
+    assert len(created) > 20
+    assert len(set(created)) == len(created)
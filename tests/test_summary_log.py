@@ -0,0 +1,12 @@
+from summary_log import append_summary, iter_summary, tail_summary
+
+
+def test_append_after_truncated_line(tmp_path):
+    log = tmp_path / "summary.jsonl"
+    append_summary(log, {"run": 1})
+    with open(log, "ab") as f:
+        f.write(b'{"run": 2, "trunc')  # A crash mid-append
+    append_summary(log, {"run": 3})
+    append_summary(log, {"run": 4})
+    assert list(iter_summary(log)) == [{"run": 1}, {"run": 3}, {"run": 4}]
+    assert tail_summary(log, 2) == [{"run": 3}, {"run": 4}]
@@ -0,0 +1,100 @@
+import math
+import random
+
+import numpy as np
+
+import vectorized_engine
+from interaction_memory import InteractionMemory
+from particle_array import ParticleArray, POSITIVE, ADAPTIVE
+from run_simulation import create_particle_from_field, run_simulation
+
+
+def sequential_pairs(particles, learning_rate, rng):
+    """Pair-by-pair reference for interact_all_pairs, drawing the same numbers"""
+    n = len(particles)
+    total = 0
+    for i in range(n):
+        particles.age[i] += 1
+        if i == n - 1:
+            break
+        draws = rng.random((4, n - i - 1))
+        for j in range(i + 1, n):
+            t = j - i - 1
+            chance = vectorized_engine.interaction_chance_row(
+                i, j, particles.charge[:n], particles.type[:n], particles.phase[:n])[0]
+            if draws[0, t] > chance:
+                continue
+            total += 1
+            transfer = min(particles.knowledge[i], particles.knowledge[j]) * learning_rate * 0.5
+            particles.knowledge[i] += transfer
+            particles.knowledge[j] += transfer
+            for a in (i, j):
+                particles.interactions[a] += 1
+                particles.age[a] += 1
+            if particles.type[i] == ADAPTIVE:
+                particles.adaptive_score[i] += 0.05 * min(1, (particles.knowledge[j] + particles.energy[j]) / 2)
+            if particles.type[j] == ADAPTIVE:
+                particles.adaptive_score[j] += 0.05 * min(1, (particles.knowledge[i] + particles.energy[i]) / 2)
+            if draws[1, t] < vectorized_engine.CLUSTER_CHANCE:
+                vectorized_engine.join_clusters(particles, i, np.array([j]))
+            if (particles.knowledge[i] > 1 and particles.knowledge[j] > 1 and
+                    particles.energy[i] > 0.4 and particles.energy[j] > 0.4):
+                entropy_factor = (2 - particles.entropy[i] - particles.entropy[j]) / 2
+                age_factor = min(1, (particles.age[i] + particles.age[j]) / 200)
+                opposite = (particles.charge[i] == POSITIVE) != (particles.charge[j] == POSITIVE)
+                if draws[2, t] < 0.6 * entropy_factor * age_factor and opposite:
+                    if draws[3, t] < 0.5:
+                        vectorized_engine.form_composite(particles, i, j)
+                    else:
+                        vectorized_engine.form_composite(particles, j, i)
+    return total
+
+
+def make_particles(seed, count=60):
+    rng = random.Random(seed)
+    particles = ParticleArray(capacity=count, memory=InteractionMemory())
+    for i in range(count):
+        particles.append(create_particle_from_field(rng.uniform(-1, 1), i, True, rng))
+    return particles
+
+
+def test_rows_compound_like_the_pairwise_loop():
+    for seed in range(3):
+        expected, actual = make_particles(seed), make_particles(seed)
+        expected_rng, actual_rng = np.random.default_rng(seed), np.random.default_rng(seed)
+        for _ in range(30):
+            interactions, removed = vectorized_engine.interact_all_pairs(actual, 0.1, actual_rng)
+            assert interactions == sequential_pairs(expected, 0.1, expected_rng)
+            assert not removed.any()
+        n = len(expected)
+        for column in ("knowledge", "complexity", "energy", "entropy", "adaptive_score"):
+            np.testing.assert_allclose(getattr(actual, column)[:n], getattr(expected, column)[:n], rtol=1e-9)
+        for column in ("age", "interactions", "cluster_id", "type"):
+            np.testing.assert_array_equal(getattr(actual, column)[:n], getattr(expected, column)[:n])
+
+
+def summary_statistics(engine, seeds=24):
+    rows = []
+    for seed in range(seeds):
+        data, _ = run_simulation(max_particles=30, iterations=101, engine=engine, seed=seed, sample_every=100)
+        last = data[-1]
+        rows.append((
+            math.log10(last["avg_knowledge"]),
+            math.log10(last["avg_complexity"]),
+            last["total_interactions"],
+            last["particle_counts"]["composite"],
+            last["cluster_analysis"]["cluster_count"],
+        ))
+    return np.mean(rows, axis=0)
+
+
+def test_engines_agree_on_summary_statistics():
+    scalar = summary_statistics("scalar")
+    vectorized = summary_statistics("vectorized")
+    log_knowledge, log_complexity, interactions, composites, clusters = np.abs(scalar - vectorized)
+    # About two standard errors of the difference between 24-seed means
+    assert log_knowledge < 0.75
+    assert log_complexity < 0.25
+    assert interactions < 0.01 * scalar[2]
+    assert composites < 1.5
+    assert clusters < 0.75